@@ -50,6 +50,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "planetarium.middleware.QueryBudgetMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -97,6 +98,22 @@ DATABASES = {
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
+# New passwords are hashed with Argon2 when argon2-cffi is installed, see
+# PASSWORD_HASHING; the other hashers verify older hashes, which are
+# upgraded on login.
+PASSWORD_HASHERS = [
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
+try:
+    import argon2  # noqa: F401
+except ImportError:
+    pass
+else:
+    PASSWORD_HASHERS.insert(0, "user.hashers.Argon2PasswordHasher")
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -139,13 +156,28 @@ AUTH_USER_MODEL = "user.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # Counted in the database and shared by all workers, see
+    # planetarium.throttling. Views set throttle_scope to "browse",
+    # "booking" or "auth" for a second, scoped limit.
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "planetarium.throttling.SlidingWindowRateThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "10/day", "user": "30/day"},
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "10/day",
+        "user": "30/day",
+        "browse": "120/min",
+        "booking": "20/min",
+        "auth": "10/min",
+    },
+    # Builds request.user from the token claims without a query, see
+    # user.authentication.
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.StatelessJWTAuthentication",
+    ),
+    # Encodes with orjson when it is installed, see planetarium.renderers.
+    "DEFAULT_RENDERER_CLASSES": (
+        "planetarium.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
     ),
 }
 
@@ -164,6 +196,22 @@ SPECTACULAR_SETTINGS = {
     "COMPONENT_SPLIT_REQUEST": True,
 }
 
+# Set REDIS_URL to share the cache between workers, which the waiting room
+# and the response cache need in production.
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
@@ -172,4 +220,76 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
+    "TOKEN_OBTAIN_SERIALIZER": "user.serializers.TokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "user.serializers.TokenRefreshSerializer",
+    "TOKEN_VERIFY_SERIALIZER": "user.serializers.TokenVerifySerializer",
+    "TOKEN_BLACKLIST_SERIALIZER": "user.serializers.TokenBlacklistSerializer",
+    "TOKEN_USER_CLASS": "user.authentication.TokenUser",
+}
+
+# Query count and database time of every request, see
+# planetarium.middleware.QueryBudgetMiddleware.
+QUERY_BUDGET_HEADERS = DEBUG
+QUERY_BUDGET_WARNING = 50
+
+# Seconds before a worker rebuilds its in-memory autocomplete index, which
+# bounds how stale suggestions from other workers' writes can be.
+AUTOCOMPLETE_INDEX_TTL = 300
+
+# How long seats stay held for a buyer during checkout.
+SEAT_HOLD_TTL = timedelta(minutes=10)
+
+# Waiting room in front of the booking endpoints, see planetarium.admission.
+# Point CACHE at a shared cache (e.g. database or redis) when running
+# several workers.
+ADMISSION_CONTROL = {
+    "ENABLED": True,
+    "CACHE": "default",
+    "MAX_CONCURRENT_BUYERS": 50,
+    "SLOT_TIMEOUT": 30,
+    "QUEUE_TOKEN_TIMEOUT": 600,
+    "RETRY_AFTER": 2,
+}
+
+# Cached list/retrieve responses of the catalog and show session endpoints,
+# see planetarium.response_cache. TIMEOUTS overrides TIMEOUT (seconds) per
+# viewset basename, and LIST_TIMEOUTS overrides both for list responses.
+# Ticket sales do not invalidate session lists, so their seats_left is up to
+# LIST_TIMEOUTS["showsession"] seconds old.
+RESPONSE_CACHE = {
+    "ENABLED": True,
+    "CACHE": "default",
+    "TIMEOUT": 300,
+    "TIMEOUTS": {"showsession": 60},
+    "LIST_TIMEOUTS": {"showsession": 5},
+}
+
+# Re-read is_active and is_staff of token users at most every TTL seconds
+# instead of trusting the token claims until the token expires, see
+# user.authentication.StatelessJWTAuthentication.
+TOKEN_USER_CHECK = {
+    "ENABLED": False,
+    "CACHE": "default",
+    "TTL": 30,
+}
+
+# In-process Bloom filter in front of refresh token blacklist lookups, see
+# user.blacklist. It needs a cache shared by every worker (REDIS_URL) and is
+# skipped with the per-process LocMemCache. Run `python manage.py prune_token_blacklist` periodically
+# to delete expired tokens.
+TOKEN_BLACKLIST_FILTER = {
+    "ENABLED": True,
+    "CACHE": "default",
+    "MAX_AGE": 300,
+    "ERROR_RATE": 0.01,
+    "MAX_LOG_READ": 1000,
+}
+
+# Argon2 costs and the size of the per-process pool passwords are hashed
+# in, see user.hashers.
+PASSWORD_HASHING = {
+    "ARGON2_TIME_COST": 2,
+    "ARGON2_MEMORY_COST": 19456,
+    "ARGON2_PARALLELISM": 1,
+    "MAX_WORKERS": 2,
 }
@@ -7,6 +7,7 @@ from planetarium.models import (
     ShowSession,
     Reservation,
     Ticket,
+    SeatHold,
 )
 
 admin.site.register(AstronomyShow)
@@ -15,3 +16,4 @@ admin.site.register(PlanetariumDome)
 admin.site.register(ShowSession)
 admin.site.register(Reservation)
 admin.site.register(Ticket)
+admin.site.register(SeatHold)
@@ -0,0 +1,170 @@
+import random
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+DEFAULTS = {
+    "ENABLED": True,
+    "CACHE": "default",
+    "MAX_CONCURRENT_BUYERS": 50,
+    "SLOT_TIMEOUT": 30,
+    "QUEUE_TOKEN_TIMEOUT": 600,
+    "RETRY_AFTER": 2,
+}
+
+# Abandoned queue entries skipped per request when moving the queue head.
+MAX_SKIPPED_ENTRIES = 100
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "ADMISSION_CONTROL", {})}
+
+
+class WaitingRoomFull(APIException):
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
+    default_detail = "Too many buyers for this show session. Please retry later."
+    default_code = "waiting_room_full"
+
+    def __init__(self, token, position, wait):
+        super().__init__()
+        # Keep numbers as numbers instead of APIException's ErrorDetail strings.
+        self.detail = {
+            "detail": self.detail,
+            "queue_token": token,
+            "position": position,
+            "retry_after": wait,
+        }
+        self.wait = wait
+
+
+class WaitingRoom:
+    """
+    Admission control for the booking endpoints of one show session.
+
+    At most MAX_CONCURRENT_BUYERS requests hold a slot at the same time.
+    Slots are cache keys added atomically with a timeout, so a crashed
+    worker cannot leak them. Rejected buyers get a queue token and their
+    position; when they retry with the token, only the buyers at the front
+    of the queue compete for free slots.
+    """
+
+    def __init__(self, show_session_id, config=None):
+        self.config = config or get_config()
+        self.cache = caches[self.config["CACHE"]]
+        self.prefix = f"admission:{show_session_id}"
+        self.limit = self.config["MAX_CONCURRENT_BUYERS"]
+
+    def _key(self, *parts):
+        return ":".join((self.prefix, *map(str, parts)))
+
+    def _acquire_slot(self):
+        offset = random.randrange(self.limit)
+
+        for i in range(self.limit):
+            key = self._key("slot", (offset + i) % self.limit)
+
+            if self.cache.add(key, 1, timeout=self.config["SLOT_TIMEOUT"]):
+                return key
+
+        return None
+
+    def _enqueue(self, token=None):
+        token = token or uuid.uuid4().hex
+        self.cache.add(self._key("tail"), 0, timeout=None)
+
+        return token, self.cache.incr(self._key("tail"))
+
+    def _head(self, number):
+        """
+        Return the number of the last admitted buyer, skipping queue
+        entries of buyers who stopped retrying.
+        """
+        head = self.cache.get(self._key("head"), 0)
+        candidates = range(head + 1, min(number, head + 1 + MAX_SKIPPED_ENTRIES))
+        alive = self.cache.get_many([self._key("entry", n) for n in candidates])
+
+        for n in candidates:
+            if self._key("entry", n) in alive:
+                break
+            head = n
+
+        return head
+
+    def _reject(self, token, number, position):
+        wait = self.config["RETRY_AFTER"] * max(1, -(-position // self.limit))
+        # The token keeps the buyer's number, while the queue entry lapses
+        # unless the buyer comes back in time, so buyers who gave up do
+        # not block the queue for the whole token timeout.
+        self.cache.set(
+            self._key("token", token),
+            number,
+            timeout=self.config["QUEUE_TOKEN_TIMEOUT"],
+        )
+        self.cache.set(self._key("entry", number), token, timeout=wait * 2)
+
+        raise WaitingRoomFull(token, position, wait)
+
+    def admit(self, token=None):
+        """
+        Admit a buyer and return the slot key to release afterwards.
+
+        Raises WaitingRoomFull with the buyer's queue token and position
+        when the session is at capacity or other buyers are queued ahead.
+        """
+        number = self.cache.get(self._key("token", token)) if token else None
+
+        if number is None:
+            head = self.cache.get(self._key("head"), 0)
+
+            if self.cache.get(self._key("tail"), 0) <= head:
+                slot = self._acquire_slot()
+
+                if slot is not None:
+                    return slot
+
+            token, number = self._enqueue(token)
+
+        head = self._head(number)
+        position = max(number - head, 1)
+
+        if position > self.limit:
+            self._reject(token, number, position)
+
+        slot = self._acquire_slot()
+
+        if slot is None:
+            self._reject(token, number, position)
+
+        if number > self.cache.get(self._key("head"), 0):
+            self.cache.set(self._key("head"), number, timeout=None)
+
+        self.cache.delete_many([self._key("token", token), self._key("entry", number)])
+
+        return slot
+
+    def release(self, slot):
+        self.cache.delete(slot)
+
+
+@contextmanager
+def admitted(show_session_ids, token=None):
+    """
+    Hold an admission slot for every given show session while booking.
+    """
+    config = get_config()
+    acquired = []
+
+    try:
+        if config["ENABLED"]:
+            for show_session_id in sorted(set(show_session_ids)):
+                room = WaitingRoom(show_session_id, config)
+                acquired.append((room, room.admit(token)))
+
+        yield
+    finally:
+        for room, slot in acquired:
+            room.release(slot)
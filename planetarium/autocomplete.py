@@ -0,0 +1,130 @@
+import bisect
+import threading
+import time
+
+from django.conf import settings
+
+SHOW = "show"
+THEME = "theme"
+
+# Upper bound of index entries looked at per lookup, so very short
+# prefixes stay as cheap as long ones.
+MAX_SCANNED_ENTRIES = 1000
+
+
+def normalize(text):
+    return " ".join(text.casefold().split())
+
+
+class PrefixIndex:
+    """
+    In-process prefix index over show titles and theme names.
+
+    Every label is stored under each of its word suffixes ("journey to
+    mars", "to mars", "mars") in one sorted list of (key, kind, id) tuples,
+    so a lookup is a bisect plus a short scan. Patches build a new list and
+    swap it in, so lookups never need a lock.
+    """
+
+    def __init__(self):
+        # (sorted entries, labels by (kind, id)), swapped as one value.
+        self._data = ([], {})
+        self._lock = threading.Lock()
+        self.built_at = None
+
+    @staticmethod
+    def _keys(label):
+        words = normalize(label).split(" ")
+        return {" ".join(words[i:]) for i in range(len(words)) if words[i]}
+
+    def build(self, items):
+        """
+        Replace the index with (kind, id, label) items.
+        """
+        labels = {(kind, pk): label for kind, pk, label in items}
+        entries = sorted(
+            (key, kind, pk)
+            for (kind, pk), label in labels.items()
+            for key in self._keys(label)
+        )
+
+        with self._lock:
+            self._data = (entries, labels)
+            self.built_at = time.monotonic()
+
+    def add(self, kind, pk, label):
+        with self._lock:
+            entries, labels = self._data
+            entries = [entry for entry in entries if entry[1:] != (kind, pk)]
+
+            for key in self._keys(label):
+                bisect.insort(entries, (key, kind, pk))
+
+            self._data = (entries, {**labels, (kind, pk): label})
+
+    def remove(self, kind, pk):
+        with self._lock:
+            entries, labels = self._data
+            self._data = (
+                [entry for entry in entries if entry[1:] != (kind, pk)],
+                {item: label for item, label in labels.items() if item != (kind, pk)},
+            )
+
+    def clear(self):
+        with self._lock:
+            self._data = ([], {})
+            self.built_at = None
+
+    def is_stale(self, max_age):
+        return self.built_at is None or time.monotonic() - self.built_at > max_age
+
+    def search(self, text, limit=10):
+        """
+        Return up to `limit` (kind, id, label) matches of the prefix, labels
+        starting with it first.
+        """
+        prefix = normalize(text)
+
+        if not prefix:
+            return []
+
+        entries, labels = self._data
+        start = bisect.bisect_left(entries, (prefix,))
+        # Maps matched items to whether their label starts with the prefix.
+        matches = {}
+
+        for key, kind, pk in entries[start : start + MAX_SCANNED_ENTRIES]:
+            if not key.startswith(prefix):
+                break
+
+            starts = key == normalize(labels[kind, pk])
+            matches[kind, pk] = matches.get((kind, pk), False) or starts
+
+        ranked = sorted(
+            matches, key=lambda item: (not matches[item], labels[item].casefold())
+        )
+
+        return [(kind, pk, labels[kind, pk]) for kind, pk in ranked[:limit]]
+
+
+index = PrefixIndex()
+
+
+def get_index():
+    """
+    Return the shared index, rebuilding it from the database when it was
+    never built or is older than AUTOCOMPLETE_INDEX_TTL seconds. The TTL
+    bounds how long other workers, which do not receive this process'
+    model signals, can serve outdated suggestions.
+    """
+    from planetarium.models import AstronomyShow, ShowTheme
+
+    if index.is_stale(getattr(settings, "AUTOCOMPLETE_INDEX_TTL", 300)):
+        shows = AstronomyShow.objects.values_list("id", "title")
+        themes = ShowTheme.objects.values_list("id", "name")
+        index.build(
+            [(SHOW, pk, title) for pk, title in shows]
+            + [(THEME, pk, name) for pk, name in themes]
+        )
+
+    return index
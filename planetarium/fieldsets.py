@@ -0,0 +1,100 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+
+
+def parse_field_list(value):
+    return {name.strip() for name in (value or "").split(",") if name.strip()}
+
+
+def _lookup_root(lookup):
+    if isinstance(lookup, Prefetch):
+        lookup = lookup.prefetch_through
+
+    return lookup.split("__")[0]
+
+
+def _select_related_paths(select_related, prefix=""):
+    for name, nested in select_related.items():
+        path = f"{prefix}{name}"
+
+        if nested:
+            yield from _select_related_paths(nested, f"{path}__")
+        else:
+            yield path
+
+
+def prune_queryset(queryset, serializer_fields, omitted, field_requires=None):
+    """
+    Narrow a queryset to the columns and relations needed by the serializer
+    fields that are left after omitting `omitted`.
+
+    Concrete columns only used by omitted fields are deferred, and joins and
+    prefetches only used by omitted relations are dropped. Kept fields that
+    are not model fields (properties, methods) must list the model fields
+    they read in `field_requires`; if one does not, nothing is deferred.
+    """
+    model = queryset.model
+    field_requires = field_requires or {}
+    required = set()
+
+    for name, field in serializer_fields.items():
+        if name in omitted or field.source == "*":
+            continue
+
+        root = field.source.split(".")[0]
+
+        try:
+            model._meta.get_field(root)
+        except FieldDoesNotExist:
+            if name not in field_requires:
+                return queryset
+
+            required.update(field_requires[name])
+        else:
+            required.add(root)
+
+    deferred = []
+    dropped = set()
+
+    for name in omitted:
+        root = serializer_fields[name].source.split(".")[0]
+
+        try:
+            model_field = model._meta.get_field(root)
+        except FieldDoesNotExist:
+            continue
+
+        if root in required or getattr(model_field, "primary_key", False):
+            continue
+
+        if model_field.is_relation:
+            dropped.add(root)
+        elif model_field.concrete:
+            deferred.append(root)
+
+    if dropped:
+        lookups = [
+            lookup
+            for lookup in queryset._prefetch_related_lookups
+            if _lookup_root(lookup) not in dropped
+        ]
+        queryset = queryset.prefetch_related(None)
+
+        if lookups:
+            queryset = queryset.prefetch_related(*lookups)
+
+        if isinstance(queryset.query.select_related, dict):
+            paths = [
+                path
+                for path in _select_related_paths(queryset.query.select_related)
+                if path.split("__")[0] not in dropped
+            ]
+            queryset = queryset.select_related(None)
+
+            if paths:
+                queryset = queryset.select_related(*paths)
+
+    if deferred:
+        queryset = queryset.defer(*deferred)
+
+    return queryset
@@ -0,0 +1,93 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from planetarium.models import SeatHold
+
+
+class SeatsUnavailable(Exception):
+    pass
+
+
+def get_hold_ttl():
+    return getattr(settings, "SEAT_HOLD_TTL", timedelta(minutes=10))
+
+
+def _seats_filter(seats):
+    query = Q()
+
+    for row, seat in seats:
+        query |= Q(row=row, seat=seat)
+
+    return query
+
+
+def hold_seats(user, show_session, seats):
+    """
+    Hold seats of a show session for the user until the hold TTL passes.
+
+    Holds the user already has on the same seats are extended. Raises
+    SeatsUnavailable if any seat is held by somebody else.
+    """
+    now = timezone.now()
+    expires_at = now + get_hold_ttl()
+
+    try:
+        with transaction.atomic():
+            SeatHold.objects.filter(show_session=show_session).filter(
+                Q(expires_at__lte=now) | Q(user_id=user.pk)
+            ).filter(_seats_filter(seats)).delete()
+            holds = SeatHold.objects.bulk_create(
+                SeatHold(
+                    show_session=show_session,
+                    user_id=user.pk,
+                    row=row,
+                    seat=seat,
+                    expires_at=expires_at,
+                )
+                for row, seat in seats
+            )
+    except IntegrityError:
+        raise SeatsUnavailable()
+
+    return holds
+
+
+def release_seats(user, show_session, seats=None):
+    holds = SeatHold.objects.filter(show_session=show_session, user_id=user.pk)
+
+    if seats is not None:
+        holds = holds.filter(_seats_filter(seats))
+
+    return holds.delete()[0]
+
+
+def release_purchased_seats(user, seats):
+    """
+    Drop the user's holds on seats given as (show_session_id, row, seat).
+    """
+    query = Q()
+
+    for show_session_id, row, seat in seats:
+        query |= Q(show_session_id=show_session_id, row=row, seat=seat)
+
+    return SeatHold.objects.filter(user_id=user.pk).filter(query).delete()[0]
+
+
+def held_seats(show_session_ids, exclude_user=None):
+    """
+    Return active holds as a set of (show_session_id, row, seat).
+    """
+    holds = SeatHold.objects.active().filter(show_session_id__in=show_session_ids)
+
+    if exclude_user is not None:
+        holds = holds.exclude(user_id=exclude_user.pk)
+
+    return set(holds.values_list("show_session_id", "row", "seat"))
+
+
+def release_expired_holds():
+    return SeatHold.objects.expired().delete()[0]
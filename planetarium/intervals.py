@@ -0,0 +1,110 @@
+import bisect
+from collections import defaultdict
+from itertools import accumulate
+
+from django.db.models import Q
+
+SHOW_SESSION = "show_session"
+CANDIDATE = "candidate"
+
+
+class IntervalIndex:
+    """
+    Static index of half-open [start, end) intervals.
+
+    Intervals are sorted by start, next to the running maximum of their
+    ends, so a lookup bisects to the last interval starting before the
+    end of the query and walks back only while earlier intervals can
+    still reach its start.
+    """
+
+    def __init__(self, intervals=()):
+        self._intervals = sorted(intervals, key=lambda interval: interval[:2])
+        self._starts = [start for start, _, _ in self._intervals]
+        self._max_ends = list(accumulate((end for _, end, _ in self._intervals), max))
+
+    def __len__(self):
+        return len(self._intervals)
+
+    def overlapping(self, start, end):
+        """
+        Return the keys of the intervals overlapping [start, end), in
+        start order.
+        """
+        keys = []
+        position = bisect.bisect_left(self._starts, end) - 1
+
+        while position >= 0 and self._max_ends[position] > start:
+            _, other_end, key = self._intervals[position]
+
+            if other_end > start:
+                keys.append(key)
+
+            position -= 1
+
+        return keys[::-1]
+
+
+def find_show_session_overlaps(candidates):
+    """
+    Check (pk, dome id, start, end) candidates, pk being None for new
+    sessions, against the stored sessions and against each other.
+
+    Stored sessions are loaded in one query whatever the number of
+    candidates. Returns a dict mapping the position of every overlapping
+    candidate to (SHOW_SESSION, pk) or (CANDIDATE, position) of the first
+    session it overlaps.
+    """
+    from planetarium.models import ShowSession
+
+    candidates = list(candidates)
+
+    if not candidates:
+        return {}
+
+    windows = {}
+
+    for _, dome_id, start, end in candidates:
+        low, high = windows.get(dome_id, (start, end))
+        windows[dome_id] = (min(low, start), max(high, end))
+
+    query = Q()
+
+    for dome_id, (low, high) in windows.items():
+        query |= Q(planetarium_dome_id=dome_id, show_time__lt=high, end_time__gt=low)
+
+    stored = defaultdict(list)
+    rows = (
+        ShowSession.objects.filter(query)
+        .exclude(pk__in=[pk for pk, _, _, _ in candidates if pk is not None])
+        .values_list("pk", "planetarium_dome_id", "show_time", "end_time")
+    )
+
+    for pk, dome_id, start, end in rows:
+        stored[dome_id].append((start, end, pk))
+
+    indexes = {dome_id: IntervalIndex(stored[dome_id]) for dome_id in windows}
+    overlaps = {}
+
+    for position, (_, dome_id, start, end) in enumerate(candidates):
+        if keys := indexes[dome_id].overlapping(start, end):
+            overlaps[position] = (SHOW_SESSION, keys[0])
+
+    # Sweep the candidates of every dome by start, remembering the one
+    # reaching furthest so far.
+    by_dome = defaultdict(list)
+
+    for position, (_, dome_id, start, end) in enumerate(candidates):
+        by_dome[dome_id].append((start, end, position))
+
+    for intervals in by_dome.values():
+        furthest = None
+
+        for start, end, position in sorted(intervals):
+            if furthest is not None and furthest[0] > start:
+                overlaps.setdefault(position, (CANDIDATE, furthest[1]))
+
+            if furthest is None or end > furthest[0]:
+                furthest = (end, position)
+
+    return overlaps
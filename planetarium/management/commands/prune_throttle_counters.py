@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from planetarium.models import ThrottleCounter
+
+
+class Command(BaseCommand):
+    help = "Delete throttle counters of keys that made no recent requests."
+
+    def handle(self, *args, **options):
+        deleted, _ = ThrottleCounter.objects.expired().delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} throttle counters"))
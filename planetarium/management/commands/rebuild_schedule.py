@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from planetarium.schedule import refresh_schedule
+
+
+class Command(BaseCommand):
+    help = "Rebuild the schedule entries of every show session."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of show sessions loaded and written per batch.",
+        )
+
+    def handle(self, *args, **options):
+        refreshed = refresh_schedule(batch_size=options["batch_size"])
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {refreshed} schedule entries"))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max, Min
+
+from planetarium.models import ShowSession
+
+
+class Command(BaseCommand):
+    help = "Recompute capacity and tickets_sold of every show session."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of show session ids updated per statement.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        bounds = ShowSession.objects.aggregate(first=Min("pk"), last=Max("pk"))
+        updated = 0
+
+        if bounds["first"] is not None:
+            for start in range(bounds["first"], bounds["last"] + 1, batch_size):
+                updated += ShowSession.objects.filter(
+                    pk__gte=start, pk__lt=start + batch_size
+                ).recount()
+
+        self.stdout.write(self.style.SUCCESS(f"Recounted {updated} show sessions"))
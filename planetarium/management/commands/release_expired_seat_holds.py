@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from planetarium.holds import release_expired_holds
+
+
+class Command(BaseCommand):
+    help = "Delete expired seat holds in bulk."
+
+    def handle(self, *args, **options):
+        deleted = release_expired_holds()
+        self.stdout.write(self.style.SUCCESS(f"Released {deleted} expired seat holds"))
@@ -0,0 +1,71 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCounter:
+    """
+    Database execute wrapper counting queries and the time spent on them.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+class QueryBudgetMiddleware:
+    """
+    Record the number of queries and the database time of every request.
+
+    The numbers are logged, and added to the response as X-DB-Query-Count
+    and X-DB-Time-Ms headers when QUERY_BUDGET_HEADERS is enabled.
+    Requests running more than QUERY_BUDGET_WARNING queries are logged as
+    warnings.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+
+            response = self.get_response(request)
+
+        duration_ms = counter.duration * 1000
+        level = (
+            logging.WARNING
+            if counter.count > getattr(settings, "QUERY_BUDGET_WARNING", 50)
+            else logging.DEBUG
+        )
+        logger.log(
+            level,
+            "%s %s ran %d queries in %.2f ms",
+            request.method,
+            request.path,
+            counter.count,
+            duration_ms,
+        )
+
+        if getattr(settings, "QUERY_BUDGET_HEADERS", False):
+            response["X-DB-Query-Count"] = str(counter.count)
+            response["X-DB-Time-Ms"] = f"{duration_ms:.2f}"
+
+        return response
@@ -0,0 +1,23 @@
+# Generated by Django 5.1 on 2026-10-18 18:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("planetarium", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="ticket",
+            name="reservation",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tickets",
+                to="planetarium.reservation",
+            ),
+        ),
+    ]
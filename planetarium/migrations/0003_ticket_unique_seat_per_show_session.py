@@ -0,0 +1,20 @@
+# Generated by Django 5.1 on 2026-10-18 18:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("planetarium", "0002_ticket_reservation_related_name"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="ticket",
+            constraint=models.UniqueConstraint(
+                fields=("show_session", "row", "seat"),
+                name="unique_ticket_seat_per_show_session",
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.1 on 2026-10-18 18:16
+
+from django.db import migrations, models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def recount_show_sessions(apps, schema_editor):
+    PlanetariumDome = apps.get_model("planetarium", "PlanetariumDome")
+    ShowSession = apps.get_model("planetarium", "ShowSession")
+    Ticket = apps.get_model("planetarium", "Ticket")
+
+    ShowSession.objects.update(
+        capacity=Subquery(
+            PlanetariumDome.objects.filter(pk=OuterRef("planetarium_dome_id"))
+            .annotate(capacity=F("rows") * F("seats_in_row"))
+            .values("capacity")[:1]
+        ),
+        tickets_sold=Coalesce(
+            Subquery(
+                Ticket.objects.filter(show_session=OuterRef("pk"))
+                .values("show_session")
+                .annotate(count=Count("pk"))
+                .values("count")[:1]
+            ),
+            0,
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("planetarium", "0004_seathold"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="showsession",
+            name="capacity",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="showsession",
+            name="tickets_sold",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(recount_show_sessions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1 on 2026-10-18 18:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("planetarium", "0006_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="showsession",
+            index=models.Index(
+                fields=["astronomy_show", "show_time"],
+                name="planetarium_astrono_7e5570_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="showsession",
+            index=models.Index(
+                fields=["planetarium_dome", "show_time"],
+                name="planetarium_planeta_8d0702_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.1 on 2026-10-18 18:26
+
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+INDEX_NAME = "planetarium_astronomyshow_search_vector_gin"
+
+
+def create_search_index(apps, schema_editor):
+    """
+    Add the GIN index and fill the search vectors on PostgreSQL only, so
+    the migration still runs on SQLite in tests.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    AstronomyShow = apps.get_model("planetarium", "AstronomyShow")
+    table = schema_editor.quote_name(AstronomyShow._meta.db_table)
+    schema_editor.execute(
+        f"CREATE INDEX {INDEX_NAME} ON {table} USING gin (search_vector)"
+    )
+    AstronomyShow.objects.update(
+        search_vector=SearchVector("title", weight="A", config="english")
+        + SearchVector("description", weight="B", config="english")
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("planetarium", "0007_showsession_schedule_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="astronomyshow",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 5.1 on 2026-10-18 18:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill_schedule(apps, schema_editor):
+    ScheduleEntry = apps.get_model("planetarium", "ScheduleEntry")
+    ShowSession = apps.get_model("planetarium", "ShowSession")
+    show_sessions = ShowSession.objects.select_related(
+        "astronomy_show", "planetarium_dome"
+    ).prefetch_related("astronomy_show__themes")
+    entries = [
+        ScheduleEntry(
+            show_session=show_session,
+            date=timezone.localtime(
+                show_session.show_time, timezone.get_default_timezone()
+            ).date(),
+            show_time=show_session.show_time,
+            astronomy_show=show_session.astronomy_show,
+            show_title=show_session.astronomy_show.title,
+            themes=sorted(
+                theme.name for theme in show_session.astronomy_show.themes.all()
+            ),
+            planetarium_dome=show_session.planetarium_dome,
+            dome_name=show_session.planetarium_dome.name,
+            capacity=show_session.capacity,
+            tickets_sold=show_session.tickets_sold,
+        )
+        for show_session in show_sessions.iterator(chunk_size=1000)
+    ]
+    ScheduleEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("planetarium", "0009_modelversion"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScheduleEntry",
+            fields=[
+                (
+                    "show_session",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="schedule_entry",
+                        serialize=False,
+                        to="planetarium.showsession",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("show_time", models.DateTimeField()),
+                ("show_title", models.CharField(max_length=100)),
+                ("themes", models.JSONField(default=list)),
+                ("dome_name", models.CharField(max_length=100)),
+                ("capacity", models.PositiveIntegerField(default=0)),
+                ("tickets_sold", models.PositiveIntegerField(default=0)),
+                (
+                    "astronomy_show",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="planetarium.astronomyshow",
+                    ),
+                ),
+                (
+                    "planetarium_dome",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="planetarium.planetariumdome",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "schedule entries",
+                "indexes": [
+                    models.Index(
+                        fields=["date", "show_time"], name="planetarium_date_46938a_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(fill_schedule, migrations.RunPython.noop),
+    ]
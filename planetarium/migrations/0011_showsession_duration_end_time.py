@@ -0,0 +1,86 @@
+# Generated by Django 5.1 on 2026-10-18 19:40
+
+from datetime import timedelta
+
+import django.core.validators
+from django.db import migrations, models
+
+
+def fill_end_times(apps, schema_editor):
+    ShowSession = apps.get_model("planetarium", "ShowSession")
+    ScheduleEntry = apps.get_model("planetarium", "ScheduleEntry")
+    show_sessions = ShowSession.objects.select_related("astronomy_show").only(
+        "show_time", "duration", "astronomy_show__duration"
+    )
+    batch = []
+
+    for show_session in show_sessions.iterator(chunk_size=1000):
+        duration = show_session.duration or show_session.astronomy_show.duration
+        show_session.end_time = show_session.show_time + timedelta(minutes=duration)
+        batch.append(show_session)
+
+        if len(batch) == 1000:
+            ShowSession.objects.bulk_update(batch, ["end_time"])
+            batch = []
+
+    ShowSession.objects.bulk_update(batch, ["end_time"])
+    ScheduleEntry.objects.update(
+        end_time=models.Subquery(
+            ShowSession.objects.filter(pk=models.OuterRef("pk")).values("end_time")
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("planetarium", "0010_scheduleentry"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="astronomyshow",
+            name="duration",
+            field=models.PositiveIntegerField(
+                default=60,
+                validators=[django.core.validators.MinValueValidator(1)],
+            ),
+        ),
+        migrations.AddField(
+            model_name="showsession",
+            name="duration",
+            field=models.PositiveIntegerField(
+                blank=True,
+                null=True,
+                validators=[django.core.validators.MinValueValidator(1)],
+            ),
+        ),
+        migrations.AddField(
+            model_name="showsession",
+            name="end_time",
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="scheduleentry",
+            name="end_time",
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(fill_end_times, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="showsession",
+            name="end_time",
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.AlterField(
+            model_name="scheduleentry",
+            name="end_time",
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name="showsession",
+            index=models.Index(
+                fields=["planetarium_dome", "end_time"],
+                name="planetarium_planeta_67e17c_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.1 on 2026-10-18 19:45
+
+from django.db import migrations
+
+CONSTRAINT_NAME = "planetarium_showsession_no_overlap"
+
+
+def add_overlap_constraint(apps, schema_editor):
+    """
+    Exclude overlapping sessions of a dome on PostgreSQL only, so the
+    migration still runs on SQLite in tests. Elsewhere overlaps are only
+    caught by planetarium.intervals.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    ShowSession = apps.get_model("planetarium", "ShowSession")
+    table = schema_editor.quote_name(ShowSession._meta.db_table)
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT a.id, b.id FROM {table} a JOIN {table} b "
+            "ON a.planetarium_dome_id = b.planetarium_dome_id AND a.id < b.id "
+            "AND a.show_time < b.end_time AND b.show_time < a.end_time "
+            "LIMIT 20"
+        )
+        overlaps = cursor.fetchall()
+
+    if overlaps:
+        raise RuntimeError(
+            "Reschedule the overlapping show sessions before migrating: "
+            + ", ".join(f"{a} and {b}" for a, b in overlaps)
+        )
+
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    schema_editor.execute(
+        f"ALTER TABLE {table} ADD CONSTRAINT {CONSTRAINT_NAME} "
+        "EXCLUDE USING gist (planetarium_dome_id WITH =, "
+        "tstzrange(show_time, end_time, '[)') WITH &&)"
+    )
+
+
+def drop_overlap_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    ShowSession = apps.get_model("planetarium", "ShowSession")
+    table = schema_editor.quote_name(ShowSession._meta.db_table)
+    schema_editor.execute(
+        f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {CONSTRAINT_NAME}"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("planetarium", "0011_showsession_duration_end_time"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_overlap_constraint, drop_overlap_constraint),
+    ]
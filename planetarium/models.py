@@ -1,7 +1,28 @@
 import os
 import uuid
+from datetime import timedelta
 
-from django.db import models
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    SearchVectorField,
+)
+from django.core.validators import MinValueValidator
+from django.db import connection, models
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from app import settings
 
 
@@ -18,6 +39,59 @@ def astronomy_show_file_path(instance, filename):
     return os.path.join("uploads", "movies", filename)
 
 
+SEARCH_CONFIG = "english"
+
+# Show columns not needed where a show is only referred to by its title.
+SHOW_DETAIL_FIELDS = ("description", "image", "search_vector")
+
+
+def show_details_deferred(path):
+    """
+    Return defer() lookups skipping SHOW_DETAIL_FIELDS of the show at `path`.
+    """
+    return [f"{path}__{name}" for name in SHOW_DETAIL_FIELDS]
+
+
+def astronomy_show_search_vector():
+    return SearchVector("title", weight="A", config=SEARCH_CONFIG) + SearchVector(
+        "description", weight="B", config=SEARCH_CONFIG
+    )
+
+
+class AstronomyShowQuerySet(models.QuerySet):
+    def search(self, text):
+        """
+        Filter shows matching the text, best matches first.
+
+        PostgreSQL ranks matches of the stored search_vector; other
+        databases fall back to substring matching that ranks title
+        matches above description matches.
+        """
+        if connection.vendor == "postgresql":
+            query = SearchQuery(text, search_type="websearch", config=SEARCH_CONFIG)
+            return (
+                self.filter(search_vector=query)
+                .annotate(rank=SearchRank(F("search_vector"), query))
+                .order_by("-rank", "id")
+            )
+
+        return (
+            self.filter(Q(title__icontains=text) | Q(description__icontains=text))
+            .annotate(
+                rank=Case(
+                    When(title__icontains=text, then=Value(1.0)), default=Value(0.5)
+                )
+            )
+            .order_by("-rank", "id")
+        )
+
+    def update_search_vector(self):
+        if connection.vendor == "postgresql":
+            return self.update(search_vector=astronomy_show_search_vector())
+
+        return 0
+
+
 class AstronomyShow(models.Model):
     title = models.CharField(max_length=100)
     description = models.TextField()
@@ -25,6 +99,22 @@ class AstronomyShow(models.Model):
     image = models.ImageField(
         null=True, upload_to=astronomy_show_file_path, max_length=255
     )
+    # Minutes, unless a session overrides it.
+    duration = models.PositiveIntegerField(
+        default=60, validators=[MinValueValidator(1)]
+    )
+    # Kept up to date by planetarium.signals, PostgreSQL only.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = AstronomyShowQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Sessions without their own duration end with the show.
+        end_time = F("show_time") + timedelta(minutes=self.duration)
+        ShowSession.objects.filter(astronomy_show=self, duration__isnull=True).exclude(
+            end_time=end_time
+        ).update(end_time=end_time)
 
     def __str__(self):
         return self.title
@@ -35,23 +125,128 @@ class PlanetariumDome(models.Model):
     rows = models.IntegerField()
     seats_in_row = models.IntegerField()
 
+    @property
+    def capacity(self):
+        return self.rows * self.seats_in_row
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        ShowSession.objects.filter(planetarium_dome=self).exclude(
+            capacity=self.capacity
+        ).update(capacity=self.capacity)
+
     def __str__(self):
         return self.name
 
 
+class ShowSessionQuerySet(models.QuerySet):
+    def recount(self):
+        """
+        Recompute capacity and tickets_sold of the sessions in one UPDATE.
+        """
+        return self.update(
+            capacity=Subquery(
+                PlanetariumDome.objects.filter(pk=OuterRef("planetarium_dome_id"))
+                .annotate(capacity=F("rows") * F("seats_in_row"))
+                .values("capacity")[:1]
+            ),
+            tickets_sold=Coalesce(
+                Subquery(
+                    Ticket.objects.filter(show_session=OuterRef("pk"))
+                    .values("show_session")
+                    .annotate(count=Count("pk"))
+                    .values("count")[:1]
+                ),
+                0,
+            ),
+        )
+
+
 class ShowSession(models.Model):
     astronomy_show = models.ForeignKey(AstronomyShow, on_delete=models.CASCADE)
     planetarium_dome = models.ForeignKey(PlanetariumDome, on_delete=models.CASCADE)
     show_time = models.DateTimeField()
+    # Minutes, overriding the duration of the show when set.
+    duration = models.PositiveIntegerField(
+        null=True, blank=True, validators=[MinValueValidator(1)]
+    )
+    # show_time plus the duration, so that overlapping sessions of a dome
+    # can be found with an index (and excluded by a constraint on PostgreSQL).
+    end_time = models.DateTimeField(editable=False)
+    # Denormalized from the dome and the tickets, see planetarium.signals.
+    capacity = models.PositiveIntegerField(default=0, editable=False)
+    tickets_sold = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = ShowSessionQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["show_time", "id"]),
+            models.Index(fields=["astronomy_show", "show_time"]),
+            models.Index(fields=["planetarium_dome", "show_time"]),
+            models.Index(fields=["planetarium_dome", "end_time"]),
+        ]
+
+    @property
+    def seats_left(self):
+        return max(self.capacity - self.tickets_sold, 0)
+
+    @property
+    def is_sold_out(self):
+        return self.seats_left == 0
+
+    @property
+    def effective_duration(self):
+        return self.duration or self.astronomy_show.duration
+
+    def save(self, *args, **kwargs):
+        self.capacity = self.planetarium_dome.capacity
+        self.show_time = self._meta.get_field("show_time").to_python(self.show_time)
+        self.end_time = self.show_time + timedelta(minutes=self.effective_duration)
+
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            # tickets_sold only changes with F() updates, see
+            # planetarium.signals, writing back a stale count would undo sales.
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "tickets_sold"
+            ]
+
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.astronomy_show} {self.planetarium_dome} in {self.show_time}"
 
 
+class ReservationQuerySet(models.QuerySet):
+    def with_tickets(self):
+        """
+        Load reservations with their users and tickets, including the
+        tickets' sessions, shows and domes, in two queries.
+        """
+        return self.select_related("user").prefetch_related(
+            Prefetch(
+                "tickets",
+                queryset=Ticket.objects.select_related(
+                    "show_session__astronomy_show", "show_session__planetarium_dome"
+                ).defer(*show_details_deferred("show_session__astronomy_show")),
+            )
+        )
+
+
 class Reservation(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
 
+    objects = ReservationQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"]),
+            models.Index(fields=["user", "created_at", "id"]),
+        ]
+
     def __str__(self):
         return f"Reservation {self.user} {self.created_at}"
 
@@ -60,4 +255,205 @@ class Ticket(models.Model):
     row = models.IntegerField()
     seat = models.IntegerField()
     show_session = models.ForeignKey(ShowSession, on_delete=models.CASCADE)
-    reservation = models.ForeignKey(Reservation, on_delete=models.CASCADE)
+    reservation = models.ForeignKey(
+        Reservation, on_delete=models.CASCADE, related_name="tickets"
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["show_session", "row", "seat"],
+                name="unique_ticket_seat_per_show_session",
+            )
+        ]
+
+
+class SeatHoldQuerySet(models.QuerySet):
+    def active(self):
+        return self.filter(expires_at__gt=timezone.now())
+
+    def expired(self):
+        return self.filter(expires_at__lte=timezone.now())
+
+
+class SeatHold(models.Model):
+    show_session = models.ForeignKey(
+        ShowSession, on_delete=models.CASCADE, related_name="seat_holds"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="seat_holds"
+    )
+    row = models.IntegerField()
+    seat = models.IntegerField()
+    expires_at = models.DateTimeField(db_index=True)
+
+    objects = SeatHoldQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["show_session", "row", "seat"],
+                name="unique_seat_hold_per_show_session",
+            )
+        ]
+
+    def __str__(self):
+        return (
+            f"Hold {self.row}-{self.seat} {self.show_session} until {self.expires_at}"
+        )
+
+
+class ModelVersionQuerySet(models.QuerySet):
+    def bump(self, model):
+        """
+        Increase the version of `model`, creating its row on first use.
+        """
+        name = model._meta.label_lower
+        now = timezone.now()
+
+        if not self.filter(name=name).update(version=F("version") + 1, updated_at=now):
+            self.get_or_create(name=name, defaults={"version": 1, "updated_at": now})
+
+    def for_models(self, models):
+        return self.filter(name__in=[model._meta.label_lower for model in models])
+
+
+class ModelVersion(models.Model):
+    """
+    Version stamp of a model's rows, bumped whenever one of them is saved
+    or deleted, see planetarium.signals. Conditional GET uses it to tell
+    whether a response may have changed without querying the rows.
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField()
+
+    objects = ModelVersionQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+
+class ScheduleEntry(models.Model):
+    """
+    Read model of a show session with its show, themes and dome joined in,
+    served by the schedule endpoint. Kept up to date by
+    planetarium.signals, see planetarium.schedule.
+    """
+
+    show_session = models.OneToOneField(
+        ShowSession,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="schedule_entry",
+    )
+    # Day of the show time in TIME_ZONE.
+    date = models.DateField()
+    show_time = models.DateTimeField()
+    end_time = models.DateTimeField()
+    astronomy_show = models.ForeignKey(
+        AstronomyShow, on_delete=models.CASCADE, related_name="+"
+    )
+    show_title = models.CharField(max_length=100)
+    themes = models.JSONField(default=list)
+    planetarium_dome = models.ForeignKey(
+        PlanetariumDome, on_delete=models.CASCADE, related_name="+"
+    )
+    dome_name = models.CharField(max_length=100)
+    capacity = models.PositiveIntegerField(default=0)
+    tickets_sold = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=["date", "show_time"])]
+        verbose_name_plural = "schedule entries"
+
+    @property
+    def seats_left(self):
+        return max(self.capacity - self.tickets_sold, 0)
+
+    @property
+    def is_sold_out(self):
+        return self.seats_left == 0
+
+    def __str__(self):
+        return f"{self.show_title} {self.dome_name} in {self.show_time}"
+
+
+class ThrottleCounterQuerySet(models.QuerySet):
+    def hit(self, windows):
+        """
+        Count a request of every key in `windows`, a dict mapping keys to
+        (window, expires_at), with one atomic upsert. A key whose window has
+        advanced by one moves its count to previous_count first.
+        Returns a dict mapping every key to its (count, previous_count).
+        """
+        quote = connection.ops.quote_name
+        table = quote(self.model._meta.db_table)
+        key, window, count, previous, expires_at = map(
+            quote, ("key", "window", "count", "previous_count", "expires_at")
+        )
+        # Sorted, so concurrent upserts lock the rows in the same order.
+        keys = sorted(windows)
+        sql = (
+            f"INSERT INTO {table} ({key}, {window}, {count}, {previous}, "
+            f"{expires_at}) VALUES "
+            + ", ".join(["(%s, %s, 1, 0, %s)"] * len(keys))
+            + f" ON CONFLICT ({key}) DO UPDATE SET "
+            f"{previous} = CASE WHEN {table}.{window} = EXCLUDED.{window} "
+            f"THEN {table}.{previous} "
+            f"WHEN {table}.{window} = EXCLUDED.{window} - 1 "
+            f"THEN {table}.{count} ELSE 0 END, "
+            f"{count} = CASE WHEN {table}.{window} = EXCLUDED.{window} "
+            f"THEN {table}.{count} + 1 ELSE 1 END, "
+            f"{window} = EXCLUDED.{window}, "
+            f"{expires_at} = EXCLUDED.{expires_at} "
+            f"RETURNING {key}, {count}, {previous}"
+        )
+        params = []
+
+        for name in keys:
+            window_index, expires = windows[name]
+            params += [
+                name,
+                window_index,
+                connection.ops.adapt_datetimefield_value(expires),
+            ]
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return {name: (hits, previous_hits) for name, hits, previous_hits in cursor}
+
+    def unhit(self, windows):
+        """
+        Take back a request counted by hit() with the same `windows`, unless
+        its key has moved to a later window since.
+        """
+        condition = Q()
+
+        for name, (window, _) in windows.items():
+            condition |= Q(key=name, window=window)
+
+        return self.filter(condition, count__gt=0).update(count=F("count") - 1)
+
+    def expired(self):
+        return self.filter(expires_at__lte=timezone.now())
+
+
+class ThrottleCounter(models.Model):
+    """
+    Requests of one throttle key in its current and previous fixed window,
+    shared by all workers, see planetarium.throttling.
+    """
+
+    key = models.CharField(max_length=255, primary_key=True)
+    # Start of the window divided by the window duration.
+    window = models.BigIntegerField()
+    count = models.PositiveIntegerField(default=0)
+    previous_count = models.PositiveIntegerField(default=0)
+    expires_at = models.DateTimeField(db_index=True)
+
+    objects = ThrottleCounterQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.key}: {self.count}"
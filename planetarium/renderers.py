@@ -0,0 +1,149 @@
+import csv
+import io
+from itertools import islice
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+class SeatBitmapRenderer(BaseRenderer):
+    """
+    Renders a packed seat bitmap as raw bytes.
+    """
+
+    media_type = "application/octet-stream"
+    format = "bin"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, (bytes, bytearray)):
+            return bytes(data)
+
+        return b""
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer encoding with orjson when it is installed.
+
+    The output matches JSONRenderer's compact, unicode output. Indented
+    output, non-compact or ASCII-only settings and a missing orjson all
+    fall back to JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or not self.compact
+            or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data,
+            default=self.encoder_class().default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+        )
+
+        # Escape the same line separators as JSONRenderer, see its render().
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+
+
+class StreamingJSONRenderer(FastJSONRenderer):
+    """
+    Renders a list as a JSON array encoded chunk by chunk.
+
+    Views select it with ?format=stream and return a StreamingHttpResponse
+    over render_stream(), so neither the list nor the document is ever
+    held in memory as a whole. Other responses, such as errors, are
+    rendered like FastJSONRenderer does.
+    """
+
+    format = "stream"
+
+    def render_stream(self, items, chunk_size=1000, fields=None):
+        items = iter(items)
+        separator = b""
+
+        yield b"["
+
+        while chunk := list(islice(items, chunk_size)):
+            # Encode the chunk as an array and drop its brackets.
+            yield separator + self.render(chunk)[1:-1]
+            separator = b","
+
+        yield b"]"
+
+
+class NDJSONRenderer(FastJSONRenderer):
+    """
+    Renders rows as newline delimited JSON, one object per line.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        rows = data if isinstance(data, list) else [data]
+
+        return b"".join(self.render_stream(rows))
+
+    def render_stream(self, items, chunk_size=1000, fields=None):
+        items = iter(items)
+        encode = super().render
+
+        while chunk := list(islice(items, chunk_size)):
+            yield b"".join(encode(row) + b"\n" for row in chunk)
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Renders rows (dicts) as CSV with a header line of their keys.
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        rows = data if isinstance(data, list) else [data]
+
+        return b"".join(self.render_stream(rows))
+
+    def render_stream(self, items, chunk_size=1000, fields=None):
+        """
+        Yield the CSV encoded in chunks of `chunk_size` rows. The header
+        lists `fields`, or the keys of the first row when not given.
+        """
+        items = iter(items)
+        buffer = io.StringIO()
+        writer = None
+
+        while chunk := list(islice(items, chunk_size)):
+            if writer is None:
+                writer = csv.DictWriter(buffer, fields or list(chunk[0]))
+                writer.writeheader()
+
+            writer.writerows(chunk)
+            yield buffer.getvalue().encode(self.charset)
+            buffer.seek(0)
+            buffer.truncate()
+
+        if writer is None and fields:
+            csv.writer(buffer).writerow(fields)
+            yield buffer.getvalue().encode(self.charset)
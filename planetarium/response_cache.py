@@ -0,0 +1,82 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+DEFAULTS = {
+    "ENABLED": True,
+    "CACHE": "default",
+    "TIMEOUT": 300,
+    # Per viewset basename, e.g. {"showsession": 30}.
+    "TIMEOUTS": {},
+    # Per viewset basename for list responses, overriding TIMEOUTS.
+    "LIST_TIMEOUTS": {},
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "RESPONSE_CACHE", {})}
+
+
+def get_cache():
+    return caches[get_config()["CACHE"]]
+
+
+def model_scope(model):
+    """
+    Scope of everything built from the rows of `model`, such as lists.
+    """
+    return model._meta.label_lower
+
+
+def object_scope(model, pk):
+    """
+    Scope of the responses built from one row of `model`.
+    """
+    return f"{model._meta.label_lower}:{pk}"
+
+
+def _generation_key(scope):
+    return f"response-cache:generation:{scope}"
+
+
+def get_generations(scopes):
+    """
+    Return the current generation of every scope.
+
+    Generations are random tokens rather than counters, so a generation
+    evicted from the cache is replaced by a new token instead of falling
+    back to a value older responses were cached under.
+    """
+    cache = get_cache()
+    keys = {scope: _generation_key(scope) for scope in scopes}
+    found = cache.get_many(keys.values())
+    generations = {}
+
+    for scope, key in keys.items():
+        if key not in found:
+            token = uuid.uuid4().hex
+            cache.add(key, token, timeout=None)
+            found[key] = cache.get(key) or token
+
+        generations[scope] = found[key]
+
+    return generations
+
+
+def invalidate(scopes):
+    """
+    Start a new generation of every scope, so responses cached under the
+    previous ones are not served again.
+    """
+    get_cache().set_many(
+        {_generation_key(scope): uuid.uuid4().hex for scope in scopes}, timeout=None
+    )
+
+
+def response_key(basename, path, generations):
+    stamp = ",".join(f"{scope}={generations[scope]}" for scope in sorted(generations))
+    digest = hashlib.sha256(f"{path}|{stamp}".encode()).hexdigest()
+
+    return f"response-cache:{basename}:{digest}"
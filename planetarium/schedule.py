@@ -0,0 +1,89 @@
+from datetime import timedelta
+from itertools import islice
+
+from django.db.models import F
+from django.utils import timezone
+
+from planetarium.models import ScheduleEntry, ShowSession
+
+ENTRY_FIELDS = (
+    "date",
+    "show_time",
+    "end_time",
+    "astronomy_show",
+    "show_title",
+    "themes",
+    "planetarium_dome",
+    "dome_name",
+    "capacity",
+    "tickets_sold",
+)
+
+
+def build_entry(show_session):
+    show = show_session.astronomy_show
+    dome = show_session.planetarium_dome
+
+    return ScheduleEntry(
+        show_session=show_session,
+        date=timezone.localtime(
+            show_session.show_time, timezone.get_default_timezone()
+        ).date(),
+        show_time=show_session.show_time,
+        # Not show_session.end_time, which the show updates after its post_save.
+        end_time=show_session.show_time
+        + timedelta(minutes=show_session.duration or show.duration),
+        astronomy_show=show,
+        show_title=show.title,
+        themes=sorted(theme.name for theme in show.themes.all()),
+        planetarium_dome=dome,
+        dome_name=dome.name,
+        # From the dome, as its post_save runs before it updates the sessions.
+        capacity=dome.capacity,
+        tickets_sold=show_session.tickets_sold,
+    )
+
+
+def refresh_schedule(show_sessions=None, batch_size=1000):
+    """
+    Create or update the schedule entries of the given show sessions, all
+    of them by default, in batches of `batch_size`. Returns the number of
+    refreshed entries.
+    """
+    if show_sessions is None:
+        show_sessions = ShowSession.objects.all()
+
+    show_sessions = (
+        show_sessions.select_related("astronomy_show", "planetarium_dome")
+        .only(
+            "show_time",
+            "duration",
+            "tickets_sold",
+            "astronomy_show__title",
+            "astronomy_show__duration",
+            "planetarium_dome__name",
+            "planetarium_dome__rows",
+            "planetarium_dome__seats_in_row",
+        )
+        .prefetch_related("astronomy_show__themes")
+        .order_by("pk")
+    )
+    show_sessions = show_sessions.iterator(chunk_size=batch_size)
+    refreshed = 0
+
+    while batch := list(islice(show_sessions, batch_size)):
+        ScheduleEntry.objects.bulk_create(
+            [build_entry(show_session) for show_session in batch],
+            update_conflicts=True,
+            unique_fields=["show_session"],
+            update_fields=ENTRY_FIELDS,
+        )
+        refreshed += len(batch)
+
+    return refreshed
+
+
+def change_schedule_tickets_sold(show_session_id, delta):
+    ScheduleEntry.objects.filter(show_session_id=show_session_id).update(
+        tickets_sold=F("tickets_sold") + delta
+    )
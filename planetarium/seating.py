@@ -0,0 +1,99 @@
+import base64
+import math
+from collections import defaultdict
+
+
+def seat_index(row, seat, seats_in_row):
+    """Return the bit position of a 1-based (row, seat) pair."""
+    return (row - 1) * seats_in_row + (seat - 1)
+
+
+def seat_in_dome(row, seat, dome):
+    return 1 <= row <= dome.rows and 1 <= seat <= dome.seats_in_row
+
+
+def pack_seat_bitmap(rows, seats_in_row, taken):
+    """
+    Pack taken seats into a bitmap with one bit per seat.
+
+    Seats are numbered row by row, most significant bit first, so the
+    first seat of the first row is the highest bit of the first byte.
+    Seats outside of the dome are ignored.
+    """
+    bitmap = bytearray((rows * seats_in_row + 7) // 8)
+
+    for row, seat in taken:
+        if 1 <= row <= rows and 1 <= seat <= seats_in_row:
+            index = seat_index(row, seat, seats_in_row)
+            bitmap[index // 8] |= 0x80 >> (index % 8)
+
+    return bytes(bitmap)
+
+
+def encode_seat_bitmap(bitmap):
+    return base64.b64encode(bitmap).decode("ascii")
+
+
+def free_intervals(seats_in_row, taken_seats):
+    """
+    Return the free (first, last) seat intervals of a row.
+    """
+    intervals = []
+    first = 1
+
+    for seat in sorted(taken_seats):
+        if seat > first:
+            intervals.append((first, min(seat, seats_in_row + 1) - 1))
+
+        first = max(first, seat + 1)
+
+    if first <= seats_in_row:
+        intervals.append((first, seats_in_row))
+
+    return intervals
+
+
+def find_best_block(rows, seats_in_row, taken, size):
+    """
+    Find the block of `size` adjacent free seats in one row closest to the
+    centre of the dome.
+
+    Returns a (row, [seats]) tuple or None if no row has enough adjacent
+    free seats. Rows are visited from the centre outwards, so the search
+    stops as soon as a row cannot beat the best block found so far.
+    """
+    if size < 1 or size > seats_in_row:
+        return None
+
+    taken_by_row = defaultdict(set)
+
+    for row, seat in taken:
+        taken_by_row[row].add(seat)
+
+    centre_row = (rows + 1) / 2
+    centre_seat = (seats_in_row + 1) / 2
+    ideal_first = math.floor(centre_seat - (size - 1) / 2 + 0.5)
+    best = None
+
+    for row in sorted(range(1, rows + 1), key=lambda r: (abs(r - centre_row), r)):
+        if best is not None and abs(row - centre_row) >= best[0]:
+            break
+
+        for first, last in free_intervals(seats_in_row, taken_by_row[row]):
+            if last - first + 1 < size:
+                continue
+
+            start = min(max(ideal_first, first), last - size + 1)
+            distance = math.hypot(
+                row - centre_row, start + (size - 1) / 2 - centre_seat
+            )
+
+            if best is None or distance < best[0]:
+                best = (distance, row, start)
+
+    if best is None:
+        return None
+
+    _, row, start = best
+
+    return row, list(range(start, start + size))
@@ -1,19 +1,67 @@
-from rest_framework import serializers
-
+from collections import Counter
+from datetime import datetime, timedelta
+from itertools import chain
+from operator import itemgetter
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from planetarium import holds
+from planetarium.intervals import CANDIDATE, find_show_session_overlaps
 from planetarium.models import (
     AstronomyShow,
     ShowTheme,
     PlanetariumDome,
     ShowSession,
     Reservation,
+    ScheduleEntry,
     Ticket,
 )
+from planetarium.seating import seat_in_dome
+from planetarium.response_cache import model_scope
+from planetarium.schedule import refresh_schedule
+from planetarium.signals import change_tickets_sold, invalidate_responses
+
+SEAT_TAKEN_MESSAGE = "Це місце вже зайняте для цієї сесії."
+SESSION_OVERLAP_MESSAGE = "Сесія перетинається з іншою сесією в цьому куполі."
+IMPORT_MAX_SESSIONS = 5000
+
+
+def describe_overlap(overlap):
+    kind, key = overlap
+
+    if kind == CANDIDATE:
+        return f"перетинається з сесією #{key} цього імпорту"
+
+    return f"перетинається з сесією {key}"
 
 
 class AstronomyShowSerializer(serializers.ModelSerializer):
     class Meta:
         model = AstronomyShow
-        fields = ("id", "title", "description", "themes", "image")
+        fields = ("id", "title", "description", "themes", "image", "duration")
+
+    def validate_duration(self, duration):
+        if self.instance is None or duration == self.instance.duration:
+            return duration
+
+        # Sessions without their own duration would end at a new time.
+        show_sessions = ShowSession.objects.filter(
+            astronomy_show=self.instance, duration__isnull=True
+        ).values_list("pk", "planetarium_dome_id", "show_time")
+        overlaps = find_show_session_overlaps(
+            (pk, dome_id, show_time, show_time + timedelta(minutes=duration))
+            for pk, dome_id, show_time in show_sessions
+        )
+
+        if overlaps:
+            raise serializers.ValidationError(
+                "З новою тривалістю сесії цього шоу перетинатимуться з іншими."
+            )
+
+        return duration
 
 
 class ShowThemeSerializer(serializers.ModelSerializer):
@@ -38,7 +86,7 @@ class AstronomyShowDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = AstronomyShow
-        fields = ("id", "title", "description", "themes", "image")
+        fields = ("id", "title", "description", "themes", "image", "duration")
 
 
 class PlanetariumDomeSerializer(serializers.ModelSerializer):
@@ -50,7 +98,42 @@ class PlanetariumDomeSerializer(serializers.ModelSerializer):
 class ShowSessionSerializer(serializers.ModelSerializer):
     class Meta:
         model = ShowSession
-        fields = ("astronomy_show", "planetarium_dome", "show_time")
+        fields = ("astronomy_show", "planetarium_dome", "show_time", "duration")
+
+    def validate(self, attrs):
+        instance = self.instance
+
+        def get(name):
+            return attrs[name] if name in attrs else getattr(instance, name, None)
+
+        show_time = get("show_time")
+        duration = get("duration") or get("astronomy_show").duration
+        candidate = (
+            instance and instance.pk,
+            get("planetarium_dome").pk,
+            show_time,
+            show_time + timedelta(minutes=duration),
+        )
+
+        if find_show_session_overlaps([candidate]):
+            raise serializers.ValidationError({"show_time": [SESSION_OVERLAP_MESSAGE]})
+
+        return attrs
+
+    # Concurrent writes are rejected by the exclusion constraint on PostgreSQL.
+    def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError({"show_time": [SESSION_OVERLAP_MESSAGE]})
+
+    def update(self, instance, validated_data):
+        try:
+            with transaction.atomic():
+                return super().update(instance, validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError({"show_time": [SESSION_OVERLAP_MESSAGE]})
 
 
 class ShowSessionListSerializer(serializers.ModelSerializer):
@@ -61,18 +144,91 @@ class ShowSessionListSerializer(serializers.ModelSerializer):
         many=False, slug_field="name", queryset=PlanetariumDome.objects.all()
     )
 
+    seats_left = serializers.IntegerField(read_only=True)
+    sold_out = serializers.BooleanField(source="is_sold_out", read_only=True)
+
     class Meta:
         model = ShowSession
-        fields = ("astronomy_show", "planetarium_dome", "show_time")
+        fields = (
+            "astronomy_show",
+            "planetarium_dome",
+            "show_time",
+            "end_time",
+            "capacity",
+            "seats_left",
+            "sold_out",
+        )
 
 
 class ShowSessionDetailSerializer(serializers.ModelSerializer):
     astronomy_show = AstronomyShowListSerializer(read_only=True)
     planetarium_dome = PlanetariumDomeSerializer(read_only=True)
+    seats_left = serializers.IntegerField(read_only=True)
+    sold_out = serializers.BooleanField(source="is_sold_out", read_only=True)
 
     class Meta:
         model = ShowSession
-        fields = ("id", "astronomy_show", "planetarium_dome", "show_time")
+        fields = (
+            "id",
+            "astronomy_show",
+            "planetarium_dome",
+            "show_time",
+            "end_time",
+            "capacity",
+            "seats_left",
+            "sold_out",
+        )
+
+
+class ScheduleSessionSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source="show_session_id", read_only=True)
+    seats_left = serializers.IntegerField(read_only=True)
+    sold_out = serializers.BooleanField(source="is_sold_out", read_only=True)
+
+    class Meta:
+        model = ScheduleEntry
+        fields = (
+            "id",
+            "show_time",
+            "end_time",
+            "astronomy_show",
+            "show_title",
+            "themes",
+            "planetarium_dome",
+            "dome_name",
+            "capacity",
+            "seats_left",
+            "sold_out",
+        )
+
+
+class ScheduleDaySerializer(serializers.Serializer):
+    date = serializers.DateField()
+    sessions = ScheduleSessionSerializer(many=True)
+
+
+class ShowSessionSeatsSerializer(serializers.Serializer):
+    rows = serializers.IntegerField()
+    seats_in_row = serializers.IntegerField()
+    bitmap = serializers.CharField(
+        help_text="Base64 encoded bitmap with one bit per seat, row by row."
+    )
+    taken = serializers.ListField(
+        child=serializers.ListField(child=serializers.IntegerField()),
+        help_text="Taken seats as [row, seat] pairs.",
+    )
+
+
+class BestSeatsSerializer(serializers.Serializer):
+    row = serializers.IntegerField(read_only=True)
+    seats = serializers.ListField(child=serializers.IntegerField(), read_only=True)
+    size = serializers.IntegerField(min_value=1, write_only=True)
+
+
+class AutocompleteSerializer(serializers.Serializer):
+    type = serializers.CharField()
+    id = serializers.IntegerField()
+    label = serializers.CharField()
 
 
 class ReservationShortSerializer(serializers.ModelSerializer):
@@ -83,6 +239,98 @@ class ReservationShortSerializer(serializers.ModelSerializer):
         fields = ("created_at", "user")
 
 
+class ShowSessionImportItemSerializer(serializers.Serializer):
+    astronomy_show = serializers.IntegerField()
+    planetarium_dome = serializers.IntegerField()
+    show_time = serializers.DateTimeField()
+    duration = serializers.IntegerField(min_value=1, required=False, allow_null=True)
+
+
+class ShowSessionImportSerializer(serializers.Serializer):
+    sessions = ShowSessionImportItemSerializer(
+        many=True, allow_empty=False, max_length=IMPORT_MAX_SESSIONS
+    )
+
+    def validate_sessions(self, sessions):
+        shows = AstronomyShow.objects.only("duration").in_bulk(
+            {session["astronomy_show"] for session in sessions}
+        )
+        domes = PlanetariumDome.objects.only("rows", "seats_in_row").in_bulk(
+            {session["planetarium_dome"] for session in sessions}
+        )
+        errors = []
+
+        for position, session in enumerate(sessions):
+            show = shows.get(session["astronomy_show"])
+            dome = domes.get(session["planetarium_dome"])
+
+            if show is None:
+                errors.append(
+                    f"Сесія #{position}: шоу {session['astronomy_show']} не знайдено."
+                )
+
+            if dome is None:
+                errors.append(
+                    f"Сесія #{position}: купол {session['planetarium_dome']} "
+                    "не знайдено."
+                )
+
+            if show and dome:
+                session["astronomy_show"] = show
+                session["planetarium_dome"] = dome
+                duration = session.get("duration") or show.duration
+                session["end_time"] = session["show_time"] + timedelta(minutes=duration)
+
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        overlaps = find_show_session_overlaps(
+            (
+                None,
+                session["planetarium_dome"].pk,
+                session["show_time"],
+                session["end_time"],
+            )
+            for session in sessions
+        )
+
+        for position, overlap in sorted(overlaps.items()):
+            errors.append(f"Сесія #{position} {describe_overlap(overlap)}.")
+
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        return sessions
+
+    def create(self, validated_data):
+        # bulk_create() skips save() and the signals, so capacity, the
+        # schedule and cached responses are handled here.
+        show_sessions = [
+            ShowSession(capacity=session["planetarium_dome"].capacity, **session)
+            for session in validated_data["sessions"]
+        ]
+
+        try:
+            with transaction.atomic():
+                show_sessions = ShowSession.objects.bulk_create(
+                    show_sessions, batch_size=1000
+                )
+                refresh_schedule(
+                    ShowSession.objects.filter(
+                        pk__in=[show_session.pk for show_session in show_sessions]
+                    )
+                )
+        except IntegrityError:
+            raise serializers.ValidationError({"sessions": [SESSION_OVERLAP_MESSAGE]})
+
+        invalidate_responses([model_scope(ShowSession)])
+
+        return show_sessions
+
+    def to_representation(self, instance):
+        return {"ids": [show_session.pk for show_session in instance]}
+
+
 class ShowSessionShortSerializer(ShowSessionSerializer):
     astronomy_show = serializers.SlugRelatedField(read_only=True, slug_field="title")
     planetarium_dome = serializers.SlugRelatedField(read_only=True, slug_field="name")
@@ -101,18 +349,17 @@ class TicketCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Ticket
         fields = ("row", "seat", "show_session", "reservation")
+        # Seat uniqueness is enforced by the database constraint, see create().
+        validators = []
 
-    def validate(self, data):
-        row = data.get("row")
-        seat = data.get("seat")
-        show_session = data.get("show_session")
-
-        if Ticket.objects.filter(
-            show_session=show_session, row=row, seat=seat
-        ).exists():
-            raise serializers.ValidationError("Це місце вже зайняте для цієї сесії.")
-
-        return data
+    def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [SEAT_TAKEN_MESSAGE]}
+            )
 
 
 class TicketListSerializer(serializers.ModelSerializer):
@@ -140,3 +387,317 @@ class TicketDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = Ticket
         fields = ("id", "row", "seat", "show_session", "reservation")
+
+
+class CheckoutTicketSerializer(serializers.Serializer):
+    row = serializers.IntegerField(min_value=1)
+    seat = serializers.IntegerField(min_value=1)
+    show_session = serializers.IntegerField()
+
+
+class ReservationCheckoutSerializer(serializers.Serializer):
+    tickets = CheckoutTicketSerializer(many=True, allow_empty=False)
+
+    def validate_tickets(self, tickets):
+        session_ids = {ticket["show_session"] for ticket in tickets}
+        show_sessions = ShowSession.objects.select_related("planetarium_dome").in_bulk(
+            session_ids
+        )
+
+        errors = []
+        seats = set()
+
+        for ticket in tickets:
+            row, seat = ticket["row"], ticket["seat"]
+            show_session = show_sessions.get(ticket["show_session"])
+
+            if show_session is None:
+                errors.append(f"Сесію {ticket['show_session']} не знайдено.")
+                continue
+
+            dome = show_session.planetarium_dome
+
+            if not seat_in_dome(row, seat, dome):
+                errors.append(f"Місця {row}-{seat} немає в куполі {dome}.")
+
+            key = (show_session.id, row, seat)
+
+            if key in seats:
+                errors.append(f"Місце {row}-{seat} вказано кілька разів.")
+
+            seats.add(key)
+            ticket["show_session"] = show_session
+
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        taken = set(
+            Ticket.objects.filter(
+                show_session_id__in=session_ids,
+                row__in={row for _, row, _ in seats},
+                seat__in={seat for _, _, seat in seats},
+            ).values_list("show_session_id", "row", "seat")
+        )
+        taken |= holds.held_seats(
+            session_ids, exclude_user=self.context["request"].user
+        )
+
+        for session_id, row, seat in sorted(seats & taken):
+            errors.append(f"Місце {row}-{seat} вже зайняте для сесії {session_id}.")
+
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        return tickets
+
+    def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                reservation = Reservation.objects.create(
+                    user_id=validated_data["user"].pk
+                )
+                tickets = Ticket.objects.bulk_create(
+                    Ticket(reservation=reservation, **ticket)
+                    for ticket in validated_data["tickets"]
+                )
+                holds.release_purchased_seats(
+                    validated_data["user"],
+                    [(t.show_session_id, t.row, t.seat) for t in tickets],
+                )
+                # bulk_create() skips post_save, so count the tickets here.
+                sold = Counter(ticket.show_session_id for ticket in tickets)
+
+                for show_session_id, count in sold.items():
+                    change_tickets_sold(show_session_id, count)
+        except IntegrityError:
+            raise serializers.ValidationError({"tickets": [SEAT_TAKEN_MESSAGE]})
+
+        return reservation
+
+
+class SeatSerializer(serializers.Serializer):
+    row = serializers.IntegerField(min_value=1)
+    seat = serializers.IntegerField(min_value=1)
+
+
+class SeatHoldSerializer(serializers.Serializer):
+    seats = SeatSerializer(many=True, allow_empty=False)
+    expires_at = serializers.DateTimeField(read_only=True)
+
+    def validate_seats(self, seats):
+        show_session = self.context["show_session"]
+        dome = show_session.planetarium_dome
+        errors = []
+        requested = set()
+
+        for seat in seats:
+            key = (seat["row"], seat["seat"])
+
+            if not seat_in_dome(*key, dome):
+                errors.append(f"Місця {key[0]}-{key[1]} немає в куполі {dome}.")
+
+            if key in requested:
+                errors.append(f"Місце {key[0]}-{key[1]} вказано кілька разів.")
+
+            requested.add(key)
+
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        sold = set(
+            Ticket.objects.filter(
+                show_session=show_session,
+                row__in={row for row, _ in requested},
+                seat__in={seat for _, seat in requested},
+            ).values_list("row", "seat")
+        )
+
+        for row, seat in sorted(requested & sold):
+            errors.append(f"Місце {row}-{seat} вже зайняте для цієї сесії.")
+
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        return seats
+
+    def create(self, validated_data):
+        seats = [(seat["row"], seat["seat"]) for seat in validated_data["seats"]]
+
+        try:
+            seat_holds = holds.hold_seats(
+                validated_data["user"], self.context["show_session"], seats
+            )
+        except holds.SeatsUnavailable:
+            raise serializers.ValidationError(
+                {"seats": ["Деякі з цих місць вже утримує інший покупець."]}
+            )
+
+        return {
+            "seats": validated_data["seats"],
+            "expires_at": seat_holds[0].expires_at,
+        }
+
+
+class ValuesSerializer:
+    """
+    Read-only list serializer building responses from values() rows, so no
+    model instances or serializer fields are created per row.
+
+    `columns` maps the output fields, in output order, to the values()
+    lookups they read. A field without a get_<field>() method outputs its
+    only column as is. The output must match `serializer_class`, the model
+    serializer this one stands in for on list endpoints.
+    """
+
+    serializer_class = None
+    columns = {}
+
+    def __init__(self, omitted=()):
+        self.field_names = [name for name in self.columns if name not in omitted]
+        self.getters = [
+            (name, getattr(self, f"get_{name}", itemgetter(self.columns[name][0])))
+            for name in self.field_names
+        ]
+        self.format_datetime = self.get_datetime_formatter()
+
+    @staticmethod
+    def get_datetime_formatter():
+        """
+        Return a function formatting datetimes like DateTimeField does.
+
+        The output format and timezone are looked up once instead of for
+        every value; anything but aware datetimes in ISO 8601 is left to
+        DateTimeField itself.
+        """
+        field = serializers.DateTimeField()
+        output_format = api_settings.DATETIME_FORMAT
+        field_timezone = field.default_timezone()
+
+        if output_format is None or output_format.lower() != ISO_8601:
+            return field.to_representation
+
+        if field_timezone is None:
+            return field.to_representation
+
+        def format_datetime(value):
+            if not isinstance(value, datetime) or value.tzinfo is None:
+                return field.to_representation(value)
+
+            value = value.astimezone(field_timezone).isoformat()
+
+            if value.endswith("+00:00"):
+                value = value[:-6] + "Z"
+
+            return value
+
+        return format_datetime
+
+    def project(self, queryset, extra_columns=()):
+        """
+        Turn the queryset into a values() queryset of the needed columns,
+        plus `extra_columns` such as pagination ordering fields.
+        """
+        columns = {
+            "id",
+            *extra_columns,
+            *chain.from_iterable(self.columns[name] for name in self.field_names),
+        }
+
+        return queryset.prefetch_related(None).values(*sorted(columns))
+
+    def to_representation(self, row):
+        return {name: getter(row) for name, getter in self.getters}
+
+    def many(self, rows):
+        return [self.to_representation(row) for row in rows]
+
+
+class ShowSessionListValuesSerializer(ValuesSerializer):
+    serializer_class = ShowSessionListSerializer
+    columns = {
+        "astronomy_show": ("astronomy_show__title",),
+        "planetarium_dome": ("planetarium_dome__name",),
+        "show_time": ("show_time",),
+        "end_time": ("end_time",),
+        "capacity": ("capacity",),
+        "seats_left": ("capacity", "tickets_sold"),
+        "sold_out": ("capacity", "tickets_sold"),
+    }
+
+    def get_show_time(self, row):
+        return self.format_datetime(row["show_time"])
+
+    def get_end_time(self, row):
+        return self.format_datetime(row["end_time"])
+
+    def get_seats_left(self, row):
+        return max(row["capacity"] - row["tickets_sold"], 0)
+
+    def get_sold_out(self, row):
+        return row["tickets_sold"] >= row["capacity"]
+
+
+class TicketListValuesSerializer(ValuesSerializer):
+    serializer_class = TicketListSerializer
+    # ReservationShortSerializer shows users as str(user), their username.
+    user_column = f"reservation__user__{get_user_model().USERNAME_FIELD}"
+    columns = {
+        "row": ("row",),
+        "seat": ("seat",),
+        "show_session": (
+            "show_session__astronomy_show__title",
+            "show_session__planetarium_dome__name",
+            "show_session__show_time",
+        ),
+        "reservation": ("reservation__created_at", user_column),
+    }
+
+    def get_show_session(self, row):
+        return {
+            "astronomy_show": row["show_session__astronomy_show__title"],
+            "planetarium_dome": row["show_session__planetarium_dome__name"],
+            "show_time": self.format_datetime(row["show_session__show_time"]),
+        }
+
+    def get_reservation(self, row):
+        return {
+            "created_at": self.format_datetime(row["reservation__created_at"]),
+            "user": row[self.user_column],
+        }
+
+
+class TicketExportSerializer(ValuesSerializer):
+    columns = {
+        "id": ("id",),
+        "row": ("row",),
+        "seat": ("seat",),
+        "show_session": ("show_session_id",),
+        "show_time": ("show_session__show_time",),
+        "astronomy_show": ("show_session__astronomy_show__title",),
+        "planetarium_dome": ("show_session__planetarium_dome__name",),
+        "reservation": ("reservation_id",),
+        "reserved_at": ("reservation__created_at",),
+        "user": (f"reservation__user__{get_user_model().USERNAME_FIELD}",),
+    }
+
+    def get_show_time(self, row):
+        return self.format_datetime(row["show_session__show_time"])
+
+    def get_reserved_at(self, row):
+        return self.format_datetime(row["reservation__created_at"])
+
+
+class ReservationExportSerializer(ValuesSerializer):
+    """
+    Expects reservations annotated with `ticket_count`.
+    """
+
+    columns = {
+        "id": ("id",),
+        "created_at": ("created_at",),
+        "user": (f"user__{get_user_model().USERNAME_FIELD}",),
+        "tickets": ("ticket_count",),
+    }
+
+    def get_created_at(self, row):
+        return self.format_datetime(row["created_at"])
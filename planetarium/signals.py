@@ -0,0 +1,278 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from planetarium import autocomplete, response_cache, schedule
+from planetarium.response_cache import model_scope, object_scope
+from planetarium.models import (
+    AstronomyShow,
+    ModelVersion,
+    PlanetariumDome,
+    ShowSession,
+    ShowTheme,
+    Ticket,
+)
+
+
+def invalidate_responses(scopes):
+    """
+    Invalidate cached responses of the scopes now, and again once the
+    transaction commits, so responses cached meanwhile by requests that
+    still saw the old rows are not served either.
+    """
+    scopes = list(scopes)
+    response_cache.invalidate(scopes)
+    transaction.on_commit(lambda: response_cache.invalidate(scopes))
+
+
+def show_session_scopes(**filters):
+    return [
+        object_scope(ShowSession, pk)
+        for pk in ShowSession.objects.filter(**filters).values_list("pk", flat=True)
+    ]
+
+
+def change_tickets_sold(show_session_id, delta):
+    ShowSession.objects.filter(pk=show_session_id).update(
+        tickets_sold=F("tickets_sold") + delta
+    )
+    schedule.change_schedule_tickets_sold(show_session_id, delta)
+    # Only the session's details: invalidating every session list on each
+    # sale would leave the busiest lists uncached while booking is busy, so
+    # lists expire after RESPONSE_CACHE["LIST_TIMEOUTS"] instead.
+    invalidate_responses([object_scope(ShowSession, show_session_id)])
+
+
+@receiver(pre_save, sender=Ticket)
+def remember_ticket_show_session(sender, instance, raw=False, **kwargs):
+    if instance.pk and not raw:
+        instance._previous_show_session_id = (
+            Ticket.objects.filter(pk=instance.pk)
+            .values_list("show_session_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Ticket)
+def count_saved_ticket(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    previous = getattr(instance, "_previous_show_session_id", None)
+
+    if created:
+        change_tickets_sold(instance.show_session_id, 1)
+    elif previous is not None and previous != instance.show_session_id:
+        change_tickets_sold(previous, -1)
+        change_tickets_sold(instance.show_session_id, 1)
+
+
+@receiver(post_delete, sender=Ticket)
+def count_deleted_ticket(sender, instance, **kwargs):
+    change_tickets_sold(instance.show_session_id, -1)
+
+
+@receiver(post_save, sender=AstronomyShow)
+def update_astronomy_show_search_vector(
+    sender, instance, raw=False, update_fields=None, **kwargs
+):
+    if raw or (update_fields and not {"title", "description"} & set(update_fields)):
+        return
+
+    AstronomyShow.objects.filter(pk=instance.pk).update_search_vector()
+
+
+AUTOCOMPLETE_LABELS = {
+    AstronomyShow: (autocomplete.SHOW, "title"),
+    ShowTheme: (autocomplete.THEME, "name"),
+}
+
+
+@receiver(post_save, sender=AstronomyShow)
+@receiver(post_save, sender=ShowTheme)
+def add_to_autocomplete_index(sender, instance, raw=False, **kwargs):
+    kind, field = AUTOCOMPLETE_LABELS[sender]
+
+    if not raw and autocomplete.index.built_at is not None:
+        label = getattr(instance, field)
+        transaction.on_commit(lambda: autocomplete.index.add(kind, instance.pk, label))
+
+
+@receiver(post_delete, sender=AstronomyShow)
+@receiver(post_delete, sender=ShowTheme)
+def remove_from_autocomplete_index(sender, instance, **kwargs):
+    kind, _ = AUTOCOMPLETE_LABELS[sender]
+    pk = instance.pk
+
+    if autocomplete.index.built_at is not None:
+        transaction.on_commit(lambda: autocomplete.index.remove(kind, pk))
+
+
+@receiver(post_save, sender=AstronomyShow)
+@receiver(post_save, sender=ShowTheme)
+@receiver(post_save, sender=PlanetariumDome)
+@receiver(post_delete, sender=AstronomyShow)
+@receiver(post_delete, sender=ShowTheme)
+@receiver(post_delete, sender=PlanetariumDome)
+def bump_model_version(sender, raw=False, **kwargs):
+    if not raw:
+        ModelVersion.objects.bump(sender)
+
+
+@receiver(m2m_changed, sender=AstronomyShow.themes.through)
+def bump_astronomy_show_version(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        ModelVersion.objects.bump(AstronomyShow)
+
+
+@receiver(post_save, sender=AstronomyShow)
+@receiver(post_delete, sender=AstronomyShow)
+def invalidate_astronomy_show_responses(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_responses(
+            [
+                model_scope(AstronomyShow),
+                object_scope(AstronomyShow, instance.pk),
+                *show_session_scopes(astronomy_show=instance.pk),
+            ]
+        )
+
+
+@receiver(m2m_changed, sender=AstronomyShow.themes.through)
+def invalidate_astronomy_show_theme_responses(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    # Clearing has no pk_set, so it is handled before the rows are gone.
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    if not reverse:
+        show_ids = [instance.pk]
+    elif pk_set:
+        show_ids = list(pk_set)
+    else:
+        show_ids = list(instance.astronomy_shows.values_list("pk", flat=True))
+
+    invalidate_responses(
+        [
+            model_scope(AstronomyShow),
+            *(object_scope(AstronomyShow, pk) for pk in show_ids),
+            *show_session_scopes(astronomy_show__in=show_ids),
+        ]
+    )
+
+
+@receiver(post_save, sender=ShowTheme)
+@receiver(pre_delete, sender=ShowTheme)
+def invalidate_show_theme_responses(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    show_ids = list(instance.astronomy_shows.values_list("pk", flat=True))
+    invalidate_responses(
+        [
+            model_scope(ShowTheme),
+            object_scope(ShowTheme, instance.pk),
+            *(object_scope(AstronomyShow, pk) for pk in show_ids),
+            *show_session_scopes(astronomy_show__in=show_ids),
+        ]
+    )
+
+
+@receiver(post_save, sender=PlanetariumDome)
+@receiver(post_delete, sender=PlanetariumDome)
+def invalidate_planetarium_dome_responses(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_responses(
+            [
+                model_scope(PlanetariumDome),
+                object_scope(PlanetariumDome, instance.pk),
+                *show_session_scopes(planetarium_dome=instance.pk),
+            ]
+        )
+
+
+@receiver(post_save, sender=ShowSession)
+@receiver(post_delete, sender=ShowSession)
+def invalidate_show_session_responses(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_responses(
+            [model_scope(ShowSession), object_scope(ShowSession, instance.pk)]
+        )
+
+
+@receiver(post_save, sender=ShowSession)
+def refresh_show_session_schedule(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule.refresh_schedule(ShowSession.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=AstronomyShow)
+def refresh_astronomy_show_schedule(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule.refresh_schedule(
+            ShowSession.objects.filter(astronomy_show=instance.pk)
+        )
+
+
+@receiver(m2m_changed, sender=AstronomyShow.themes.through)
+def refresh_astronomy_show_themes_schedule(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if not reverse:
+        show_ids = [instance.pk]
+    elif action == "pre_clear":
+        # Clearing sends no pk_set, so remember the shows before it.
+        instance._schedule_show_ids = list(
+            instance.astronomy_shows.values_list("pk", flat=True)
+        )
+        return
+    elif action == "post_clear":
+        show_ids = getattr(instance, "_schedule_show_ids", [])
+    else:
+        show_ids = pk_set
+
+    if action in ("post_add", "post_remove", "post_clear") and show_ids:
+        schedule.refresh_schedule(
+            ShowSession.objects.filter(astronomy_show__in=show_ids)
+        )
+
+
+@receiver(post_save, sender=ShowTheme)
+def refresh_show_theme_schedule(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule.refresh_schedule(
+            ShowSession.objects.filter(astronomy_show__themes=instance.pk)
+        )
+
+
+@receiver(pre_delete, sender=ShowTheme)
+def remember_show_theme_sessions(sender, instance, **kwargs):
+    instance._schedule_show_session_ids = list(
+        ShowSession.objects.filter(astronomy_show__themes=instance.pk).values_list(
+            "pk", flat=True
+        )
+    )
+
+
+@receiver(post_delete, sender=ShowTheme)
+def refresh_deleted_show_theme_schedule(sender, instance, **kwargs):
+    show_session_ids = getattr(instance, "_schedule_show_session_ids", [])
+
+    if show_session_ids:
+        schedule.refresh_schedule(ShowSession.objects.filter(pk__in=show_session_ids))
+
+
+@receiver(post_save, sender=PlanetariumDome)
+def refresh_planetarium_dome_schedule(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule.refresh_schedule(
+            ShowSession.objects.filter(planetarium_dome=instance.pk)
+        )
@@ -0,0 +1,42 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetMixin:
+    """
+    Assertions keeping the number of queries of an endpoint within a fixed
+    budget that does not grow with the number of returned objects.
+    """
+
+    def count_queries(self, url, **extra):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, **extra)
+
+        self.assertEqual(response.status_code, 200, response.content)
+
+        return len(context), context.captured_queries
+
+    def assertQueryBudget(self, url, budget, grow=None, **extra):
+        """
+        Fetch `url` and assert it runs at most `budget` queries. When `grow`
+        is given, it is called to add more objects and the endpoint must
+        run the same number of queries again.
+        """
+        count, queries = self.count_queries(url, **extra)
+        self.assertLessEqual(
+            count, budget, self._format_queries(url, budget, count, queries)
+        )
+
+        if grow is not None:
+            grow()
+            grown_count, queries = self.count_queries(url, **extra)
+            self.assertEqual(
+                grown_count,
+                count,
+                self._format_queries(url, count, grown_count, queries),
+            )
+
+    @staticmethod
+    def _format_queries(url, budget, count, queries):
+        sql = "\n".join(query["sql"] for query in queries)
+        return f"{url} ran {count} queries, budget is {budget}:\n{sql}"
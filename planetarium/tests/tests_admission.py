@@ -0,0 +1,67 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from planetarium.admission import WaitingRoom, WaitingRoomFull, admitted
+
+ADMISSION_CONTROL = {"MAX_CONCURRENT_BUYERS": 1, "RETRY_AFTER": 3}
+
+
+@override_settings(ADMISSION_CONTROL=ADMISSION_CONTROL)
+class WaitingRoomTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_admits_up_to_limit(self):
+        room = WaitingRoom(1)
+        slot = room.admit()
+
+        with self.assertRaises(WaitingRoomFull) as error:
+            room.admit()
+
+        self.assertEqual(error.exception.detail["position"], 1)
+        self.assertEqual(error.exception.wait, 3)
+
+        room.release(slot)
+        token = error.exception.detail["queue_token"]
+        self.assertIsNotNone(room.admit(token))
+
+    def test_queued_buyers_go_first(self):
+        room = WaitingRoom(1)
+        slot = room.admit()
+
+        with self.assertRaises(WaitingRoomFull) as first:
+            room.admit()
+        with self.assertRaises(WaitingRoomFull) as second:
+            room.admit()
+
+        self.assertEqual(second.exception.detail["position"], 2)
+        room.release(slot)
+
+        # A newcomer without a token must not overtake the queue.
+        with self.assertRaises(WaitingRoomFull):
+            room.admit()
+
+        self.assertIsNotNone(room.admit(first.exception.detail["queue_token"]))
+
+    def test_admitted_releases_slots(self):
+        with admitted([1, 2]):
+            with self.assertRaises(WaitingRoomFull) as error:
+                WaitingRoom(2).admit()
+
+        token = error.exception.detail["queue_token"]
+        self.assertIsNotNone(WaitingRoom(1).admit())
+        self.assertIsNotNone(WaitingRoom(2).admit(token))
+
+    def test_abandoned_buyers_are_skipped(self):
+        room = WaitingRoom(1)
+        slot = room.admit()
+
+        with self.assertRaises(WaitingRoomFull) as abandoned:
+            room.admit()
+        with self.assertRaises(WaitingRoomFull) as waiting:
+            room.admit()
+
+        room.release(slot)
+        cache.delete(room._key("entry", 1))
+        self.assertIsNotNone(room.admit(waiting.exception.detail["queue_token"]))
+        self.assertEqual(abandoned.exception.detail["position"], 1)
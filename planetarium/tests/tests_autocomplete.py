@@ -0,0 +1,90 @@
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from planetarium.autocomplete import PrefixIndex, SHOW, THEME, index
+from planetarium.models import AstronomyShow, ShowTheme
+
+User = get_user_model()
+
+
+class PrefixIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = PrefixIndex()
+        self.index.build(
+            [
+                (SHOW, 1, "Journey to Mars"),
+                (SHOW, 2, "Mars and Moons"),
+                (THEME, 1, "Martian Geology"),
+                (THEME, 2, "Stars"),
+            ]
+        )
+
+    def test_search_ranks_label_prefix_first(self):
+        self.assertEqual(
+            self.index.search("mar"),
+            [
+                (SHOW, 2, "Mars and Moons"),
+                (THEME, 1, "Martian Geology"),
+                (SHOW, 1, "Journey to Mars"),
+            ],
+        )
+
+    def test_search_limit_and_empty_prefix(self):
+        self.assertEqual(len(self.index.search("MAR", limit=1)), 1)
+        self.assertEqual(self.index.search("  "), [])
+        self.assertEqual(self.index.search("pluto"), [])
+
+    def test_add_and_remove(self):
+        self.index.add(SHOW, 1, "Pluto")
+        self.assertEqual(self.index.search("plu"), [(SHOW, 1, "Pluto")])
+        self.assertNotIn((SHOW, 1, "Journey to Mars"), self.index.search("mars"))
+
+        self.index.remove(THEME, 2)
+        self.assertEqual(self.index.search("stars"), [])
+
+
+class AutocompleteViewTests(APITestCase):
+    def setUp(self):
+        index.clear()
+        self.client.force_authenticate(
+            User.objects.create_user(email="user@test.com", password="password")
+        )
+        self.url = reverse("planetarium:astronomyshow-autocomplete")
+        self.show = AstronomyShow.objects.create(
+            title="Saturn Rings", description="Rings"
+        )
+        ShowTheme.objects.create(name="Satellites")
+
+    def tearDown(self):
+        index.clear()
+
+    def test_autocomplete(self):
+        response = self.client.get(self.url, {"q": "sat"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["label"] for item in response.data], ["Satellites", "Saturn Rings"]
+        )
+
+    def test_autocomplete_index_follows_model_signals(self):
+        self.client.get(self.url, {"q": "sat"})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.show.title = "Jupiter Moons"
+            self.show.save()
+
+        # Only the throttle counters are written.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {"q": "jup"})
+
+        self.assertEqual(
+            response.data,
+            [{"type": SHOW, "id": self.show.id, "label": "Jupiter Moons"}],
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.show.delete()
+
+        self.assertEqual(self.client.get(self.url, {"q": "jup"}).data, [])
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+from django.test import SimpleTestCase, TestCase
+from django.utils.timezone import make_aware
+
+from planetarium.intervals import (
+    CANDIDATE,
+    SHOW_SESSION,
+    IntervalIndex,
+    find_show_session_overlaps,
+)
+from planetarium.models import AstronomyShow, PlanetariumDome, ShowSession
+
+
+class IntervalIndexTests(SimpleTestCase):
+    def test_overlapping(self):
+        index = IntervalIndex([(0, 100, "long"), (10, 20, "a"), (30, 40, "b")])
+
+        self.assertEqual(index.overlapping(20, 30), ["long"])
+        self.assertEqual(index.overlapping(15, 35), ["long", "a", "b"])
+        self.assertEqual(index.overlapping(100, 110), [])
+        self.assertEqual(IntervalIndex().overlapping(0, 10), [])
+
+    def test_touching_intervals_do_not_overlap(self):
+        index = IntervalIndex([(10, 20, "a")])
+
+        self.assertEqual(index.overlapping(0, 10), [])
+        self.assertEqual(index.overlapping(20, 30), [])
+        self.assertEqual(index.overlapping(19, 30), ["a"])
+
+
+class ShowSessionOverlapTests(TestCase):
+    def setUp(self):
+        self.show = AstronomyShow.objects.create(title="Stars", description="Stars")
+        self.dome = PlanetariumDome.objects.create(name="Dome", rows=2, seats_in_row=2)
+        self.other_dome = PlanetariumDome.objects.create(
+            name="Other", rows=2, seats_in_row=2
+        )
+        self.start = make_aware(datetime(2024, 1, 1, 10, 0))
+        self.show_session = ShowSession.objects.create(
+            astronomy_show=self.show, planetarium_dome=self.dome, show_time=self.start
+        )
+
+    def at(self, minutes):
+        return self.start + timedelta(minutes=minutes)
+
+    def test_find_overlaps_in_one_query(self):
+        candidates = [
+            (None, self.dome.id, self.at(30), self.at(90)),
+            (None, self.dome.id, self.at(60), self.at(120)),
+            (None, self.other_dome.id, self.at(0), self.at(60)),
+            (None, self.other_dome.id, self.at(30), self.at(60)),
+        ]
+
+        with self.assertNumQueries(1):
+            overlaps = find_show_session_overlaps(candidates)
+
+        self.assertEqual(
+            overlaps,
+            {
+                0: (SHOW_SESSION, self.show_session.id),
+                1: (CANDIDATE, 0),
+                3: (CANDIDATE, 2),
+            },
+        )
+
+    def test_moved_session_is_not_checked_against_itself(self):
+        self.assertEqual(
+            find_show_session_overlaps(
+                [(self.show_session.id, self.dome.id, self.at(30), self.at(90))]
+            ),
+            {},
+        )
@@ -1,5 +1,8 @@
 import os
 import uuid
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
 from planetarium.models import (
     ShowTheme,
@@ -7,10 +10,11 @@ from planetarium.models import (
     PlanetariumDome,
     ShowSession,
     Reservation,
+    ScheduleEntry,
     Ticket,
 )
 from django.contrib.auth import get_user_model
-from datetime import datetime
+from datetime import datetime, timedelta
 from django.utils.timezone import make_aware
 
 User = get_user_model()
@@ -85,6 +89,44 @@ class ShowSessionModelTests(TestCase):
             str(self.session), f"{self.astronomy_show} {self.dome} in {self.show_time}"
         )
 
+    def test_show_session_capacity(self):
+        self.assertEqual(self.session.capacity, 150)
+        self.assertEqual(self.session.seats_left, 150)
+        self.assertFalse(self.session.is_sold_out)
+
+        self.dome.rows = 2
+        self.dome.save()
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.capacity, 30)
+
+    def test_schedule_entry(self):
+        entry = ScheduleEntry.objects.get(show_session=self.session)
+        self.assertEqual(entry.date.isoformat(), "2024-01-01")
+        self.assertEqual(entry.show_title, "Space Odyssey")
+        self.assertEqual(entry.capacity, 150)
+
+        self.dome.name = "Renamed Dome"
+        self.dome.rows = 2
+        self.dome.save()
+        self.astronomy_show.themes.add(ShowTheme.objects.create(name="Voyages"))
+        entry.refresh_from_db()
+        self.assertEqual(entry.dome_name, "Renamed Dome")
+        self.assertEqual(entry.capacity, 30)
+        self.assertEqual(entry.themes, ["Voyages"])
+
+        self.astronomy_show.themes.clear()
+        entry.refresh_from_db()
+        self.assertEqual(entry.themes, [])
+
+    def test_rebuild_schedule(self):
+        ScheduleEntry.objects.all().delete()
+        out = StringIO()
+        call_command("rebuild_schedule", stdout=out)
+        self.assertIn("Rebuilt 1 schedule entries", out.getvalue())
+        self.assertTrue(
+            ScheduleEntry.objects.filter(show_session=self.session).exists()
+        )
+
 
 class ReservationModelTests(TestCase):
     def setUp(self):
@@ -125,3 +167,41 @@ class TicketModelTests(TestCase):
         self.assertEqual(self.ticket.seat, 10)
         self.assertEqual(self.ticket.show_session, self.session)
         self.assertEqual(self.ticket.reservation, self.reservation)
+
+    def test_tickets_sold_counter(self):
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.tickets_sold, 1)
+        self.assertEqual(self.session.seats_left, 599)
+
+        Ticket.objects.create(
+            row=5, seat=11, show_session=self.session, reservation=self.reservation
+        )
+        self.ticket.delete()
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.tickets_sold, 1)
+
+        self.reservation.delete()
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.tickets_sold, 0)
+
+    def test_saving_a_stale_session_keeps_tickets_sold(self):
+        stale = ShowSession.objects.get(pk=self.session.pk)
+        Ticket.objects.create(
+            row=5, seat=11, show_session=self.session, reservation=self.reservation
+        )
+
+        stale.show_time = self.show_time + timedelta(hours=1)
+        stale.save()
+
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.tickets_sold, 2)
+        self.assertEqual(
+            ScheduleEntry.objects.get(show_session=self.session).tickets_sold, 2
+        )
+
+    def test_recount_show_sessions(self):
+        ShowSession.objects.update(capacity=0, tickets_sold=42)
+        call_command("recount_show_sessions", stdout=StringIO())
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.capacity, 600)
+        self.assertEqual(self.session.tickets_sold, 1)
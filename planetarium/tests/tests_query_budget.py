@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from django.utils.timezone import make_aware
+from rest_framework.test import APITestCase
+
+from planetarium.models import (
+    AstronomyShow,
+    ShowTheme,
+    PlanetariumDome,
+    ShowSession,
+    Reservation,
+    Ticket,
+)
+from planetarium.tests.query_budget import QueryBudgetMixin
+
+User = get_user_model()
+
+
+# The budgets are about the queries behind a response, not cache hits.
+@override_settings(RESPONSE_CACHE={"ENABLED": False})
+class QueryBudgetTests(QueryBudgetMixin, APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            email="admin@test.com", password="password"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.dome = PlanetariumDome.objects.create(
+            name="Budget Dome", rows=20, seats_in_row=20
+        )
+        self.reservation = Reservation.objects.create(user=self.user)
+        self.seat = 0
+        self.add_objects(2)
+
+    def add_objects(self, count):
+        for _ in range(count):
+            theme = ShowTheme.objects.create(name="Theme")
+            show = AstronomyShow.objects.create(title="Show", description="Show")
+            show.themes.add(theme, ShowTheme.objects.create(name="Another theme"))
+            session = ShowSession.objects.create(
+                astronomy_show=show,
+                planetarium_dome=self.dome,
+                show_time=make_aware(datetime(2024, 1, 1)) + timedelta(hours=count),
+            )
+            reservation = Reservation.objects.create(user=self.user)
+
+            for _ in range(2):
+                self.seat += 1
+                Ticket.objects.create(
+                    row=1, seat=self.seat, show_session=session, reservation=reservation
+                )
+                Ticket.objects.create(
+                    row=2,
+                    seat=self.seat,
+                    show_session=session,
+                    reservation=self.reservation,
+                )
+
+    def grow(self):
+        self.add_objects(3)
+
+    # Every request also counts its throttle windows with one upsert, and
+    # catalog endpoints read their ModelVersion stamps for conditional GET.
+
+    def test_astronomy_show_budget(self):
+        self.assertQueryBudget(
+            reverse("planetarium:astronomyshow-list"), 5, grow=self.grow
+        )
+        show = AstronomyShow.objects.first()
+        self.assertQueryBudget(
+            reverse("planetarium:astronomyshow-detail", args=[show.id]), 4
+        )
+
+    def test_show_theme_budget(self):
+        self.assertQueryBudget(reverse("planetarium:showtheme-list"), 3, grow=self.grow)
+
+    def test_planetarium_dome_budget(self):
+        self.assertQueryBudget(
+            reverse("planetarium:planetariumdome-list"), 3, grow=self.grow
+        )
+
+    def test_show_session_budget(self):
+        self.assertQueryBudget(
+            reverse("planetarium:showsession-list"), 2, grow=self.grow
+        )
+        session = ShowSession.objects.first()
+        self.assertQueryBudget(
+            reverse("planetarium:showsession-detail", args=[session.id]), 3
+        )
+
+    def test_reservation_budget(self):
+        self.assertQueryBudget(
+            reverse("planetarium:reservation-list"), 3, grow=self.grow
+        )
+        self.assertQueryBudget(
+            reverse("planetarium:reservation-detail", args=[self.reservation.id]),
+            3,
+            grow=self.grow,
+        )
+
+    def test_ticket_budget(self):
+        self.assertQueryBudget(reverse("planetarium:ticket-list"), 2, grow=self.grow)
+        ticket = self.reservation.tickets.first()
+        self.assertQueryBudget(
+            reverse("planetarium:ticket-detail", args=[ticket.id]), 3, grow=self.grow
+        )
+
+    @override_settings(QUERY_BUDGET_HEADERS=True)
+    def test_query_budget_middleware_headers(self):
+        response = self.client.get(reverse("planetarium:ticket-list"))
+        self.assertEqual(response["X-DB-Query-Count"], "2")
+        self.assertIn("X-DB-Time-Ms", response)
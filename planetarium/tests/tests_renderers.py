@@ -0,0 +1,43 @@
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import ReturnDict
+
+from planetarium.renderers import FastJSONRenderer, StreamingJSONRenderer
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def test_output_matches_json_renderer(self):
+        data = ReturnDict(
+            {
+                "title": "Зоряне небо ",
+                "price": Decimal("12.50"),
+                "show_time": datetime(2024, 1, 1, 10, 0, 0, 123456, timezone.utc),
+                "seats": [(1, 2), (3, 4)],
+                1: None,
+            },
+            serializer=None,
+        )
+
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indented_output(self):
+        rendered = FastJSONRenderer().render({"a": 1}, "application/json; indent=4")
+        self.assertEqual(rendered, b'{\n    "a": 1\n}')
+
+
+class StreamingJSONRendererTests(SimpleTestCase):
+    def test_render_stream(self):
+        renderer = StreamingJSONRenderer()
+        items = [{"id": i} for i in range(5)]
+
+        chunks = list(renderer.render_stream(iter(items), chunk_size=2))
+        self.assertEqual(len(chunks), 5)
+        self.assertEqual(json.loads(b"".join(chunks)), items)
+
+    def test_render_empty_stream(self):
+        renderer = StreamingJSONRenderer()
+        self.assertEqual(b"".join(renderer.render_stream(iter([]))), b"[]")
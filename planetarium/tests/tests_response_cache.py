@@ -0,0 +1,122 @@
+import shutil
+import tempfile
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from django.utils.timezone import make_aware
+from rest_framework.test import APITestCase
+
+from planetarium.models import (
+    AstronomyShow,
+    ShowTheme,
+    PlanetariumDome,
+    ShowSession,
+    Reservation,
+    Ticket,
+)
+
+User = get_user_model()
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "response-cache-tests",
+        }
+    }
+)
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="user@test.com", password="password")
+        self.client.force_authenticate(user=self.user)
+        self.theme = ShowTheme.objects.create(name="Stars")
+        self.show = AstronomyShow.objects.create(title="Stars", description="Stars")
+        self.show.themes.add(self.theme)
+        self.other_show = AstronomyShow.objects.create(
+            title="Planets", description="Planets"
+        )
+        self.other_show.themes.add(ShowTheme.objects.create(name="Planets"))
+        self.dome = PlanetariumDome.objects.create(name="Dome", rows=2, seats_in_row=2)
+        self.session = ShowSession.objects.create(
+            astronomy_show=self.show,
+            planetarium_dome=self.dome,
+            show_time=make_aware(datetime(2024, 1, 1, 10, 0)),
+        )
+
+    def test_list_is_cached(self):
+        url = reverse("planetarium:astronomyshow-list")
+        response = self.client.get(url)
+
+        # Only the throttle counters and the ModelVersion stamps of the
+        # conditional GET are touched.
+        with self.assertNumQueries(2):
+            cached = self.client.get(url)
+
+        self.assertEqual(cached.json(), response.json())
+
+    def test_theme_rename_invalidates_shows_embedding_it(self):
+        show_url = reverse("planetarium:astronomyshow-detail", args=[self.show.id])
+        other_url = reverse(
+            "planetarium:astronomyshow-detail", args=[self.other_show.id]
+        )
+        session_url = reverse("planetarium:showsession-detail", args=[self.session.id])
+        self.client.get(show_url)
+        self.client.get(other_url)
+        self.client.get(session_url)
+
+        self.theme.name = "Galaxies"
+        self.theme.save()
+
+        show = self.client.get(show_url).json()
+        self.assertEqual(show["themes"][0]["name"], "Galaxies")
+        session = self.client.get(session_url).json()
+        self.assertEqual(session["astronomy_show"]["themes"][0]["name"], "Galaxies")
+
+        with self.assertNumQueries(2):
+            self.client.get(other_url)
+
+    def test_ticket_sale_invalidates_show_session_details(self):
+        list_url = reverse("planetarium:showsession-list")
+        detail_url = reverse("planetarium:showsession-detail", args=[self.session.id])
+        self.assertEqual(
+            self.client.get(list_url).json()["results"][0]["seats_left"], 4
+        )
+        self.assertEqual(self.client.get(detail_url).json()["seats_left"], 4)
+
+        Ticket.objects.create(
+            row=1,
+            seat=1,
+            show_session=self.session,
+            reservation=Reservation.objects.create(user=self.user),
+        )
+
+        self.assertEqual(self.client.get(detail_url).json()["seats_left"], 3)
+        # Lists keep being served from the cache until they expire.
+        self.assertEqual(
+            self.client.get(list_url).json()["results"][0]["seats_left"], 4
+        )
+
+    def test_file_based_cache(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        url = reverse("planetarium:planetariumdome-list")
+
+        with self.settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": location,
+                }
+            }
+        ):
+            self.client.get(url)
+
+            with self.assertNumQueries(2):
+                self.assertEqual(self.client.get(url).json()[0]["name"], "Dome")
+
+            self.dome.name = "Main Dome"
+            self.dome.save()
+            self.assertEqual(self.client.get(url).json()[0]["name"], "Main Dome")
@@ -0,0 +1,36 @@
+from django.test import SimpleTestCase
+
+from planetarium.seating import (
+    free_intervals,
+    find_best_block,
+    pack_seat_bitmap,
+)
+
+
+class PackSeatBitmapTests(SimpleTestCase):
+    def test_pack_seat_bitmap(self):
+        bitmap = pack_seat_bitmap(2, 5, [(1, 1), (2, 5), (3, 1)])
+        self.assertEqual(bitmap, bytes([0b10000000, 0b01000000]))
+
+
+class FreeIntervalsTests(SimpleTestCase):
+    def test_free_intervals(self):
+        self.assertEqual(free_intervals(10, [3, 4, 10]), [(1, 2), (5, 9)])
+
+    def test_free_intervals_of_empty_and_full_row(self):
+        self.assertEqual(free_intervals(4, []), [(1, 4)])
+        self.assertEqual(free_intervals(2, [1, 2]), [])
+
+
+class FindBestBlockTests(SimpleTestCase):
+    def test_empty_dome_returns_centre_block(self):
+        self.assertEqual(find_best_block(5, 10, [], 2), (3, [5, 6]))
+
+    def test_taken_centre_moves_to_nearest_row(self):
+        taken = [(3, 5), (3, 6)]
+        self.assertEqual(find_best_block(5, 10, taken, 2), (2, [5, 6]))
+
+    def test_no_block_large_enough(self):
+        taken = [(1, 2), (2, 3)]
+        self.assertIsNone(find_best_block(2, 4, taken, 3))
+        self.assertIsNone(find_best_block(2, 4, [], 5))
@@ -1,4 +1,6 @@
 from django.contrib.auth import get_user_model
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APITestCase
 from planetarium.models import (
     AstronomyShow,
@@ -23,11 +25,32 @@ from planetarium.serializers import (
     TicketListSerializer,
     ReservationSerializer,
     TicketDetailSerializer,
+    ShowSessionListValuesSerializer,
+    TicketListValuesSerializer,
 )
 
 User = get_user_model()
 
 
+def render_both(values_serializer_class, queryset, omitted=()):
+    """
+    Render a queryset with a values serializer and with the model serializer
+    it stands in for.
+    """
+    values_serializer = values_serializer_class(omitted=omitted)
+    model_serializer = values_serializer_class.serializer_class(queryset, many=True)
+
+    for name in omitted:
+        model_serializer.child.fields.pop(name)
+
+    return (
+        JSONRenderer().render(
+            values_serializer.many(values_serializer.project(queryset))
+        ),
+        JSONRenderer().render(model_serializer.data),
+    )
+
+
 class AstronomyShowSerializerTests(APITestCase):
     def setUp(self):
         self.theme = ShowTheme.objects.create(name="Science")
@@ -99,6 +122,34 @@ class ShowSessionSerializerTests(APITestCase):
         self.assertEqual(serializer.data["astronomy_show"], self.show.title)
         self.assertEqual(serializer.data["planetarium_dome"], self.dome.name)
 
+    def test_show_session_list_values_serializer(self):
+        small_dome = PlanetariumDome.objects.create(
+            name="Small Dome", rows=1, seats_in_row=1
+        )
+        sold_out = ShowSession.objects.create(
+            astronomy_show=self.show,
+            planetarium_dome=small_dome,
+            show_time="2024-01-02T18:30:15.123456+02:00",
+        )
+        Ticket.objects.create(
+            show_session=sold_out,
+            reservation=Reservation.objects.create(
+                user=User.objects.create_user(email="user@test.com")
+            ),
+            row=1,
+            seat=1,
+        )
+        queryset = ShowSession.objects.order_by("show_time", "id")
+
+        fast, slow = render_both(ShowSessionListValuesSerializer, queryset)
+        self.assertEqual(fast, slow)
+        self.assertIn(b'"sold_out":true', fast)
+
+        fast, slow = render_both(
+            ShowSessionListValuesSerializer, queryset, omitted={"planetarium_dome"}
+        )
+        self.assertEqual(fast, slow)
+
     def test_show_session_detail_serializer(self):
         serializer = ShowSessionDetailSerializer(self.session)
         self.assertEqual(serializer.data["astronomy_show"]["title"], self.show.title)
@@ -131,6 +182,42 @@ class TicketSerializerTests(APITestCase):
         )
         self.assertEqual(serializer.data["reservation"]["user"], self.user.email)
 
+    def test_ticket_list_values_serializer(self):
+        Ticket.objects.create(
+            show_session=self.session, reservation=self.reservation, row=1, seat=2
+        )
+        queryset = Ticket.objects.order_by("id")
+
+        fast, slow = render_both(TicketListValuesSerializer, queryset)
+        self.assertEqual(fast, slow)
+
+    def test_ticket_create_serializer(self):
+        serializer = TicketCreateSerializer(
+            data={
+                "row": 2,
+                "seat": 3,
+                "show_session": self.session.id,
+                "reservation": self.reservation.id,
+            }
+        )
+        self.assertTrue(serializer.is_valid())
+        ticket = serializer.save()
+        self.assertEqual((ticket.row, ticket.seat), (2, 3))
+
+    def test_ticket_create_serializer_taken_seat(self):
+        serializer = TicketCreateSerializer(
+            data={
+                "row": 1,
+                "seat": 1,
+                "show_session": self.session.id,
+                "reservation": self.reservation.id,
+            }
+        )
+        self.assertTrue(serializer.is_valid())
+        with self.assertRaises(ValidationError):
+            serializer.save()
+        self.assertEqual(Ticket.objects.count(), 1)
+
     def test_ticket_detail_serializer(self):
         serializer = TicketDetailSerializer(self.ticket)
         self.assertEqual(
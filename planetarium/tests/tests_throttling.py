@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from planetarium.models import ThrottleCounter
+from planetarium.throttling import SlidingWindowRateThrottle
+
+User = get_user_model()
+
+
+def throttle_rates(**rates):
+    return override_settings(
+        REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {
+                **settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"],
+                **rates,
+            },
+        }
+    )
+
+
+class ThrottleCounterTests(TestCase):
+    def test_hit_counts_current_and_previous_window(self):
+        expires_at = timezone.now() + timedelta(minutes=2)
+
+        def hit(window):
+            return ThrottleCounter.objects.hit({"key": (window, expires_at)})["key"]
+
+        self.assertEqual(hit(10), (1, 0))
+        self.assertEqual(hit(10), (2, 0))
+        self.assertEqual(hit(11), (1, 2))
+        self.assertEqual(hit(13), (1, 0))
+        self.assertEqual(ThrottleCounter.objects.count(), 1)
+
+
+@throttle_rates(user="10/min", browse="4/min")
+class SlidingWindowRateThrottleTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="user@test.com", password="pass")
+        self.request = APIRequestFactory().get("/")
+        self.request.user = self.user
+
+    def allow(self, now, scope="browse"):
+        throttle = SlidingWindowRateThrottle()
+        throttle.timer = lambda: now
+        view = type("View", (), {"throttle_scope": scope})()
+
+        return throttle.allow_request(self.request, view), throttle
+
+    def test_previous_window_is_weighted_by_its_overlap(self):
+        for _ in range(4):
+            self.assertTrue(self.allow(60)[0])
+
+        # A quarter into the next window, 3 of the 4 requests remain.
+        allowed, throttle = self.allow(61)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(throttle.wait(), 74)
+
+        self.assertFalse(self.allow(134)[0])
+        self.assertTrue(self.allow(135)[0])
+        allowed, throttle = self.allow(136)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(throttle.wait(), 14)
+
+    def test_throttled_requests_are_not_counted(self):
+        for _ in range(4):
+            self.assertTrue(self.allow(60)[0])
+
+        for _ in range(10):
+            self.assertFalse(self.allow(61)[0])
+
+        for _ in range(6):
+            self.assertTrue(self.allow(61, scope=None)[0])
+
+        self.assertFalse(self.allow(61, scope=None)[0])
+
+    def test_user_rate_applies_without_scope(self):
+        for _ in range(10):
+            self.assertTrue(self.allow(60, scope=None)[0])
+
+        self.assertFalse(self.allow(60, scope=None)[0])
+
+    def test_long_forwarded_for_header_fits_the_key(self):
+        forwarded_for = ", ".join(f"10.0.{i // 256}.{i % 256}" for i in range(80))
+        response = self.client.post(
+            reverse("user:create"),
+            {"email": "new@test.com", "password": "testpass123"},
+            HTTP_X_FORWARDED_FOR=forwarded_for,
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        max_length = ThrottleCounter._meta.get_field("key").max_length
+        for key in ThrottleCounter.objects.values_list("key", flat=True):
+            self.assertLessEqual(len(key), max_length)
+
+    @throttle_rates(auth="2/min")
+    def test_auth_scope(self):
+        url = reverse("user:token_obtain_pair")
+        payload = {"email": "user@test.com", "password": "wrong"}
+
+        for _ in range(2):
+            response = self.client.post(url, payload)
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = self.client.post(url, payload)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response)
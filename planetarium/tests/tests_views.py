@@ -1,6 +1,17 @@
+import json
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
+
+from planetarium.admission import WaitingRoom
 from planetarium.models import (
     AstronomyShow,
     ShowTheme,
@@ -8,10 +19,11 @@ from planetarium.models import (
     ShowSession,
     Reservation,
     Ticket,
+    SeatHold,
 )
 from django.contrib.auth import get_user_model
 from django.utils.timezone import make_aware
-from datetime import datetime
+from datetime import datetime, timedelta
 
 User = get_user_model()
 
@@ -34,6 +46,62 @@ class AstronomyShowViewSetTests(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_search_astronomy_shows(self):
+        AstronomyShow.objects.create(
+            title="Black Holes", description="What happens beyond the horizon"
+        )
+        AstronomyShow.objects.create(
+            title="Night Sky", description="Stars, planets and black holes"
+        )
+        url = reverse("planetarium:astronomyshow-list")
+
+        response = self.client.get(url, {"search": "black holes"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [show["title"] for show in response.data["results"]],
+            ["Black Holes", "Night Sky"],
+        )
+
+    def test_sparse_fieldsets(self):
+        url = reverse("planetarium:astronomyshow-list")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"fields": "title"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], [{"title": "Exploring the Stars"}])
+        self.assertNotIn("description", queries[-1]["sql"])
+        self.assertNotIn("theme", queries[-1]["sql"])
+
+        response = self.client.get(url, {"omit": "description,image"})
+        self.assertEqual(set(response.data["results"][0]), {"title", "themes"})
+
+    def test_conditional_get(self):
+        url = reverse("planetarium:astronomyshow-list")
+        response = self.client.get(url)
+        etag = response["ETag"]
+        self.assertTrue(response.has_header("Last-Modified"))
+
+        # The throttle upsert and the ModelVersion stamps.
+        with self.assertNumQueries(2):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+        response = self.client.get(url, {"fields": "title"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.theme.name = "Astrophysics"
+        self.theme.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+        etag = response["ETag"]
+        self.astronomy_show.themes.clear()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
     def test_retrieve_astronomy_show(self):
         url = reverse("planetarium:astronomyshow-detail", args=[self.astronomy_show.id])
         response = self.client.get(url)
@@ -97,15 +165,222 @@ class ShowSessionViewSetTests(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_filter_show_sessions(self):
+        other_dome = PlanetariumDome.objects.create(
+            name="Other Dome", rows=5, seats_in_row=5
+        )
+        ShowSession.objects.create(
+            astronomy_show=self.astronomy_show,
+            planetarium_dome=other_dome,
+            show_time=make_aware(datetime(2024, 1, 3, 10, 0)),
+        )
+        ShowSession.objects.create(
+            astronomy_show=self.astronomy_show,
+            planetarium_dome=self.dome,
+            show_time=timezone.now() + timedelta(days=1),
+        )
+        url = reverse("planetarium:showsession-list")
+
+        def show_times(params):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return [s["show_time"] for s in response.data["results"]]
+
+        self.assertEqual(
+            len(show_times({"date_from": "2024-01-01", "date_to": "2024-01-03"})), 2
+        )
+        self.assertEqual(len(show_times({"date_to": "2024-01-02"})), 1)
+        self.assertEqual(len(show_times({"planetarium_dome": other_dome.id})), 1)
+        self.assertEqual(
+            len(show_times({"astronomy_show": f"{self.astronomy_show.id},0"})), 3
+        )
+        self.assertEqual(len(show_times({"upcoming": "true"})), 1)
+
+        response = self.client.get(url, {"date_from": "01.01.2024"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(url, {"date_from": "2024-02-30"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("date_from", response.data)
+
+        response = self.client.get(url, {"date_to": "9999-12-31"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("date_to", response.data)
+
+    def test_sparse_fieldsets_skip_joins(self):
+        url = reverse("planetarium:showsession-list")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"omit": "astronomy_show,planetarium_dome"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(response.data["results"][0]),
+            {"show_time", "end_time", "capacity", "seats_left", "sold_out"},
+        )
+        self.assertEqual(response.data["results"][0]["seats_left"], 150)
+        self.assertNotIn("JOIN", queries[-1]["sql"])
+
+    def test_schedule(self):
+        theme = ShowTheme.objects.create(name="Nebulae")
+        self.astronomy_show.themes.add(theme)
+        ShowSession.objects.create(
+            astronomy_show=self.astronomy_show,
+            planetarium_dome=self.dome,
+            show_time=make_aware(datetime(2024, 1, 3, 18, 0)),
+        )
+        ShowSession.objects.create(
+            astronomy_show=self.astronomy_show,
+            planetarium_dome=self.dome,
+            show_time=make_aware(datetime(2024, 1, 1, 8, 0)),
+        )
+        Ticket.objects.create(
+            row=1,
+            seat=1,
+            show_session=self.show_session,
+            reservation=Reservation.objects.create(
+                user=User.objects.create_user(email="user@test.com")
+            ),
+        )
+        theme.name = "Nebulas"
+        theme.save()
+        url = reverse("planetarium:showsession-schedule")
+
+        # The throttle upsert and the schedule entries.
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                url, {"date_from": "2024-01-01", "date_to": "2024-01-02"}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        day = response.data[0]
+        self.assertEqual(day["date"], "2024-01-01")
+        self.assertEqual(
+            [session["show_time"] for session in day["sessions"]],
+            ["2024-01-01T08:00:00Z", "2024-01-01T10:00:00Z"],
+        )
+        session = day["sessions"][1]
+        self.assertEqual(session["id"], self.show_session.id)
+        self.assertEqual(session["show_title"], "Nebula Show")
+        self.assertEqual(session["themes"], ["Nebulas"])
+        self.assertEqual(session["dome_name"], "Nebula Dome")
+        self.assertEqual(session["seats_left"], 149)
+
+        response = self.client.get(
+            url, {"date_from": "2024-01-01", "date_to": "2024-03-01"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(url, {"date_from": "9999-12-30"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [])
+
     def test_create_show_session(self):
         url = reverse("planetarium:showsession-list")
         data = {
             "astronomy_show": self.astronomy_show.id,
             "planetarium_dome": self.dome.id,
-            "show_time": "2024-01-01T10:00:00Z",
+            "show_time": "2024-01-01T11:00:00Z",
         }
         response = self.client.post(url, data)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            ShowSession.objects.get(
+                show_time=make_aware(datetime(2024, 1, 1, 11, 0))
+            ).end_time,
+            make_aware(datetime(2024, 1, 1, 12, 0)),
+        )
+
+    def test_create_overlapping_show_session(self):
+        url = reverse("planetarium:showsession-list")
+        data = {
+            "astronomy_show": self.astronomy_show.id,
+            "planetarium_dome": self.dome.id,
+            "show_time": "2024-01-01T09:00:00Z",
+            "duration": 90,
+        }
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("show_time", response.data)
+
+        data["duration"] = 60
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        # Moving the session onto the next one is rejected as well.
+        detail_url = reverse(
+            "planetarium:showsession-detail", args=[self.show_session.id]
+        )
+        response = self.client.patch(detail_url, {"show_time": "2024-01-01T09:30:00Z"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_longer_show_duration_overlapping_sessions_is_rejected(self):
+        ShowSession.objects.create(
+            astronomy_show=self.astronomy_show,
+            planetarium_dome=self.dome,
+            show_time=make_aware(datetime(2024, 1, 1, 11, 0)),
+        )
+        url = reverse("planetarium:astronomyshow-detail", args=[self.astronomy_show.id])
+
+        response = self.client.patch(url, {"duration": 90})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.patch(url, {"duration": 45})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.show_session.refresh_from_db()
+        self.assertEqual(
+            self.show_session.end_time, self.show_time + timedelta(minutes=45)
+        )
+
+    def test_import_show_sessions(self):
+        url = reverse("planetarium:showsession-import")
+        other_dome = PlanetariumDome.objects.create(
+            name="Other Dome", rows=5, seats_in_row=5
+        )
+        sessions = [
+            {
+                "astronomy_show": self.astronomy_show.id,
+                "planetarium_dome": other_dome.id,
+                "show_time": make_aware(datetime(2024, 2, 1, hour, 0)).isoformat(),
+            }
+            for hour in range(8, 20)
+        ]
+
+        # One query per model, however many sessions are checked, plus the
+        # throttle upsert.
+        with self.assertNumQueries(4):
+            response = self.client.post(
+                url,
+                {
+                    "sessions": sessions
+                    + [
+                        {
+                            "astronomy_show": self.astronomy_show.id,
+                            "planetarium_dome": self.dome.id,
+                            "show_time": "2024-01-01T10:30:00Z",
+                        },
+                        {
+                            "astronomy_show": self.astronomy_show.id,
+                            "planetarium_dome": other_dome.id,
+                            "show_time": "2024-02-01T19:15:00Z",
+                        },
+                    ]
+                },
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(response.data["sessions"]), 2)
+        self.assertEqual(ShowSession.objects.count(), 1)
+
+        response = self.client.post(url, {"sessions": sessions}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["ids"]), 12)
+        imported = ShowSession.objects.get(pk=response.data["ids"][0])
+        self.assertEqual(imported.capacity, 25)
+        self.assertEqual(imported.end_time, make_aware(datetime(2024, 2, 1, 9, 0)))
+        self.assertEqual(imported.schedule_entry.show_title, "Nebula Show")
 
 
 class ReservationViewSetTests(APITestCase):
@@ -119,6 +394,105 @@ class ReservationViewSetTests(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_reservations_are_scoped_to_user(self):
+        other_user = User.objects.create_user(
+            email="other@test.com", password="password"
+        )
+        other_reservation = Reservation.objects.create(user=other_user)
+
+        response = self.client.get(reverse("planetarium:reservation-list"))
+        self.assertEqual(
+            [r["id"] for r in response.data["results"]], [self.reservation.id]
+        )
+
+        url = reverse("planetarium:reservation-detail", args=[other_reservation.id])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_staff_see_all_reservations(self):
+        other_user = User.objects.create_user(
+            email="other@test.com", password="password"
+        )
+        Reservation.objects.create(user=other_user)
+        self.user.is_staff = True
+        self.user.save()
+
+        response = self.client.get(reverse("planetarium:reservation-list"))
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_stream_reservations(self):
+        url = reverse("planetarium:reservation-list")
+
+        response = self.client.get(url, {"format": "stream"})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        Reservation.objects.create(user=self.user)
+        self.user.is_staff = True
+        self.user.save()
+
+        response = self.client.get(url, {"format": "stream"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        reservations = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(len(reservations), 2)
+        self.assertEqual(reservations, self.client.get(url).json()["results"])
+
+    def test_export_reservations(self):
+        self.user.is_staff = True
+        self.user.save()
+        dome = PlanetariumDome.objects.create(name="Dome", rows=5, seats_in_row=5)
+        show_time = make_aware(datetime(2024, 1, 2, 10, 0))
+        sessions = [
+            ShowSession.objects.create(
+                astronomy_show=AstronomyShow.objects.create(
+                    title=title, description=title
+                ),
+                planetarium_dome=dome,
+                show_time=show_time,
+            )
+            for title in ("First", "Second")
+        ]
+        for seat, session in enumerate(sessions + sessions[:1], start=1):
+            Ticket.objects.create(
+                row=1, seat=seat, show_session=session, reservation=self.reservation
+            )
+        Reservation.objects.create(user=self.user)
+        url = reverse("planetarium:reservation-export")
+
+        def export(params):
+            response = self.client.get(url, {"format": "ndjson", **params})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            content = b"".join(response.streaming_content)
+            return [json.loads(line) for line in content.splitlines()]
+
+        self.assertEqual([r["tickets"] for r in export({})], [3, 0])
+        rows = export({"astronomy_show": sessions[0].astronomy_show_id})
+        self.assertEqual(
+            [(r["id"], r["tickets"]) for r in rows], [(self.reservation.id, 2)]
+        )
+        self.assertEqual(export({"date_from": "2024-01-03"}), [])
+
+    def test_reservation_lists_tickets(self):
+        astronomy_show = AstronomyShow.objects.create(
+            title="Aurora Show", description="Exploring auroras"
+        )
+        dome = PlanetariumDome.objects.create(
+            name="Aurora Dome", rows=5, seats_in_row=5
+        )
+        session = ShowSession.objects.create(
+            astronomy_show=astronomy_show,
+            planetarium_dome=dome,
+            show_time=make_aware(datetime(2024, 1, 2, 10, 0)),
+        )
+        Ticket.objects.create(
+            row=1, seat=1, show_session=session, reservation=self.reservation
+        )
+
+        response = self.client.get(reverse("planetarium:reservation-list"))
+        tickets = response.data["results"][0]["tickets"]
+        self.assertEqual(len(tickets), 1)
+        self.assertEqual(tickets[0]["show_session"]["astronomy_show"], "Aurora Show")
+
 
 class TicketViewSetTests(APITestCase):
     def setUp(self):
@@ -145,3 +519,299 @@ class TicketViewSetTests(APITestCase):
         url = reverse("planetarium:ticket-list")
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_tickets_sparse_fieldsets(self):
+        url = reverse("planetarium:ticket-list")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"fields": "row,seat"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], [{"row": 5, "seat": 10}])
+        self.assertNotIn("JOIN", queries[-1]["sql"])
+
+    def test_stream_tickets(self):
+        self.user.is_staff = True
+        self.user.save()
+        url = reverse("planetarium:ticket-list")
+
+        response = self.client.get(url, {"format": "stream", "fields": "row,seat"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(
+            json.loads(b"".join(response.streaming_content)),
+            [{"row": 5, "seat": 10}],
+        )
+
+    def test_export_tickets(self):
+        url = reverse("planetarium:ticket-export")
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+        other_session = ShowSession.objects.create(
+            astronomy_show=self.astronomy_show,
+            planetarium_dome=self.dome,
+            show_time=make_aware(datetime(2024, 2, 1, 12, 0)),
+        )
+        Ticket.objects.create(
+            row=1, seat=1, show_session=other_session, reservation=self.reservation
+        )
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            lines[0],
+            "id,row,seat,show_session,show_time,astronomy_show,"
+            "planetarium_dome,reservation,reserved_at,user",
+        )
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(
+            lines[1].startswith(
+                f"{self.ticket.id},5,10,{self.session.id},2024-01-01T12:00:00Z,"
+                "Planetary Show,Planet Dome,"
+            )
+        )
+
+        response = self.client.get(url, {"format": "ndjson", "date_from": "2024-02-01"})
+        self.assertEqual(
+            response["Content-Type"], "application/x-ndjson; charset=utf-8"
+        )
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).splitlines()
+        ]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["show_session"], other_session.id)
+        self.assertEqual(rows[0]["user"], "user@test.com")
+
+    def test_tickets_cursor_pagination(self):
+        for seat in range(1, 5):
+            Ticket.objects.create(
+                row=1,
+                seat=seat,
+                show_session=self.session,
+                reservation=self.reservation,
+            )
+
+        url = reverse("planetarium:ticket-list")
+        seen = []
+
+        while url:
+            response = self.client.get(url, {"page_size": 2} if not seen else None)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            seen.extend((t["row"], t["seat"]) for t in response.data["results"])
+            url = response.data["next"]
+
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(len(set(seen)), 5)
+
+
+class ShowSessionSeatsTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="user@test.com", password="password")
+        self.client.force_authenticate(user=self.user)
+        self.astronomy_show = AstronomyShow.objects.create(
+            title="Comet Show", description="Exploring comets"
+        )
+        self.dome = PlanetariumDome.objects.create(
+            name="Comet Dome", rows=3, seats_in_row=4
+        )
+        self.session = ShowSession.objects.create(
+            astronomy_show=self.astronomy_show,
+            planetarium_dome=self.dome,
+            show_time=make_aware(datetime(2024, 1, 1, 18, 0)),
+        )
+        reservation = Reservation.objects.create(user=self.user)
+        Ticket.objects.create(
+            row=1, seat=1, show_session=self.session, reservation=reservation
+        )
+        Ticket.objects.create(
+            row=3, seat=4, show_session=self.session, reservation=reservation
+        )
+        self.url = reverse("planetarium:showsession-seats", args=[self.session.id])
+
+    def test_seats_json(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["rows"], 3)
+        self.assertEqual(response.data["seats_in_row"], 4)
+        self.assertEqual(response.data["taken"], [[1, 1], [3, 4]])
+        self.assertEqual(response.data["bitmap"], "gBA=")
+
+    def test_seats_bitmap(self):
+        response = self.client.get(self.url, HTTP_ACCEPT="application/octet-stream")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/octet-stream")
+        self.assertEqual(response.content, bytes([0b10000000, 0b00010000]))
+
+    def test_best_seats(self):
+        url = reverse("planetarium:showsession-best-seats", args=[self.session.id])
+        self.assertTrue(url.endswith(f"/{self.session.id}/best-seats/"))
+        response = self.client.get(url, {"size": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"row": 2, "seats": [2, 3]})
+
+        response = self.client.get(url, {"size": 5})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ReservationCheckoutTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="user@test.com", password="password")
+        self.client.force_authenticate(user=self.user)
+        self.astronomy_show = AstronomyShow.objects.create(
+            title="Galaxy Show", description="Exploring galaxies"
+        )
+        self.dome = PlanetariumDome.objects.create(
+            name="Galaxy Dome", rows=5, seats_in_row=5
+        )
+        self.session = ShowSession.objects.create(
+            astronomy_show=self.astronomy_show,
+            planetarium_dome=self.dome,
+            show_time=make_aware(datetime(2024, 1, 1, 20, 0)),
+        )
+        self.url = reverse("planetarium:reservation-checkout")
+
+    def test_checkout_creates_reservation_with_tickets(self):
+        payload = {
+            "tickets": [
+                {"row": 2, "seat": seat, "show_session": self.session.id}
+                for seat in range(1, 6)
+            ]
+        }
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["tickets"]), 5)
+        self.assertEqual(response.data["user"], self.user.email)
+        reservation = Reservation.objects.get(user=self.user)
+        self.assertEqual(reservation.tickets.count(), 5)
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.tickets_sold, 5)
+
+    def test_checkout_rejects_taken_seat(self):
+        reservation = Reservation.objects.create(user=self.user)
+        Ticket.objects.create(
+            row=1, seat=1, show_session=self.session, reservation=reservation
+        )
+        payload = {
+            "tickets": [
+                {"row": 1, "seat": 1, "show_session": self.session.id},
+                {"row": 1, "seat": 2, "show_session": self.session.id},
+            ]
+        }
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Reservation.objects.count(), 1)
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_checkout_rejects_seat_outside_dome(self):
+        payload = {"tickets": [{"row": 6, "seat": 1, "show_session": self.session.id}]}
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Reservation.objects.exists())
+
+    def test_checkout_rejects_non_object_body(self):
+        response = self.client.post(self.url, [1, 2], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Reservation.objects.exists())
+
+    @override_settings(ADMISSION_CONTROL={"MAX_CONCURRENT_BUYERS": 1})
+    def test_checkout_waiting_room(self):
+        cache.clear()
+        slot = WaitingRoom(self.session.id).admit()
+        payload = {"tickets": [{"row": 1, "seat": 1, "show_session": self.session.id}]}
+
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response.data["position"], 1)
+        self.assertIn("Retry-After", response)
+
+        WaitingRoom(self.session.id).release(slot)
+        response = self.client.post(
+            self.url,
+            payload,
+            format="json",
+            HTTP_X_QUEUE_TOKEN=response.data["queue_token"],
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+
+class SeatHoldTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="user@test.com", password="password")
+        self.other_user = User.objects.create_user(
+            email="other@test.com", password="password"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.astronomy_show = AstronomyShow.objects.create(
+            title="Eclipse Show", description="Exploring eclipses"
+        )
+        self.dome = PlanetariumDome.objects.create(
+            name="Eclipse Dome", rows=5, seats_in_row=5
+        )
+        self.session = ShowSession.objects.create(
+            astronomy_show=self.astronomy_show,
+            planetarium_dome=self.dome,
+            show_time=make_aware(datetime(2024, 1, 1, 21, 0)),
+        )
+        self.url = reverse("planetarium:showsession-hold", args=[self.session.id])
+        self.payload = {"seats": [{"row": 1, "seat": 1}, {"row": 1, "seat": 2}]}
+
+    def test_hold_seats(self):
+        response = self.client.post(self.url, self.payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn("expires_at", response.data)
+        self.assertEqual(SeatHold.objects.filter(user=self.user).count(), 2)
+
+    def test_held_seats_unavailable_to_other_buyers(self):
+        self.client.post(self.url, self.payload, format="json")
+        self.client.force_authenticate(user=self.other_user)
+
+        response = self.client.post(self.url, self.payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(
+            reverse("planetarium:showsession-seats", args=[self.session.id])
+        )
+        self.assertEqual(response.data["taken"], [[1, 1], [1, 2]])
+
+        response = self.client.post(
+            reverse("planetarium:reservation-checkout"),
+            {"tickets": [{"row": 1, "seat": 1, "show_session": self.session.id}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_checkout_releases_own_holds(self):
+        self.client.post(self.url, self.payload, format="json")
+        response = self.client.post(
+            reverse("planetarium:reservation-checkout"),
+            {"tickets": [{"row": 1, "seat": 1, "show_session": self.session.id}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(list(SeatHold.objects.values_list("row", "seat")), [(1, 2)])
+
+    def test_expired_holds_are_released(self):
+        self.client.post(self.url, self.payload, format="json")
+        SeatHold.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        self.client.force_authenticate(user=self.other_user)
+        response = self.client.post(self.url, self.payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        SeatHold.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        call_command("release_expired_seat_holds", stdout=StringIO())
+        self.assertFalse(SeatHold.objects.exists())
+
+    def test_release_holds(self):
+        self.client.post(self.url, self.payload, format="json")
+        response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(SeatHold.objects.exists())
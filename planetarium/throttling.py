@@ -0,0 +1,112 @@
+import hashlib
+import time
+from datetime import datetime, timezone
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import throttling
+from rest_framework.settings import api_settings
+
+from planetarium.models import ThrottleCounter
+
+DURATIONS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """
+    Return the (number of requests, duration in seconds) of a rate such as
+    "120/min".
+    """
+    num, period = rate.split("/")
+
+    return int(num), DURATIONS[period[0]]
+
+
+class SlidingWindowRateThrottle(throttling.BaseThrottle):
+    """
+    Throttle keeping request counts in the database, so every worker
+    shares them, instead of a timestamp list in the default cache.
+
+    Every request is limited by the "user" rate, or the "anon" rate for
+    anonymous clients, and by the rate of the view's `throttle_scope`
+    ("browse", "booking" or "auth"), all counted with a single upsert.
+
+    Requests are counted in fixed windows of each rate's duration. The
+    count of the previous window is weighted by how much of it the sliding
+    window still covers, which smooths out bursts at window boundaries.
+    Throttled requests are not counted, so a request rejected by one rate
+    does not use up the others.
+    """
+
+    timer = time.time
+
+    def get_limits(self, request, view):
+        """
+        Yield the (key, number of requests, duration) limits of a request.
+        """
+        if request.user and request.user.is_authenticated:
+            scopes, ident = ["user"], f"user-{request.user.pk}"
+        else:
+            # X-Forwarded-For can be any length, keep keys short.
+            ident = hashlib.sha256(self.get_ident(request).encode()).hexdigest()
+            scopes = ["anon"]
+
+        if scope := getattr(view, "throttle_scope", None):
+            scopes.append(scope)
+
+        rates = api_settings.DEFAULT_THROTTLE_RATES
+
+        for scope in scopes:
+            if scope not in rates:
+                raise ImproperlyConfigured(
+                    f"No default throttle rate set for '{scope}' scope"
+                )
+
+            if rates[scope] is not None:
+                num_requests, duration = parse_rate(rates[scope])
+                yield f"{scope}:{ident}:{duration}", num_requests, duration
+
+    def allow_request(self, request, view):
+        limits = list(self.get_limits(request, view))
+
+        if not limits:
+            return True
+
+        now = self.timer()
+        windows = {}
+
+        for key, _, duration in limits:
+            window = int(now // duration)
+            windows[key] = (
+                window,
+                datetime.fromtimestamp((window + 2) * duration, tz=timezone.utc),
+            )
+
+        counts = ThrottleCounter.objects.hit(windows)
+        self.waits = []
+
+        for key, num_requests, duration in limits:
+            count, previous_count = counts[key]
+            remaining = 1 - (now % duration) / duration
+            excess = previous_count * remaining + count - num_requests
+
+            if excess <= 0:
+                continue
+
+            if count <= num_requests:
+                # The previous window slides out before this one ends.
+                self.waits.append(excess / previous_count * duration)
+            else:
+                # This window is full, wait until it slides out enough of
+                # the next one, where it is the previous window.
+                counted = max(count - 1, 1)
+                self.waits.append(
+                    (remaining + (count - num_requests) / counted) * duration
+                )
+
+        if self.waits:
+            ThrottleCounter.objects.unhit(windows)
+
+        return not self.waits
+
+    def wait(self):
+        return max(self.waits)
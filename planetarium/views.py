@@ -1,20 +1,48 @@
+import hashlib
+from datetime import date, datetime, time, timedelta
+from itertools import groupby, islice
+from operator import attrgetter
+
+from django.db.models import Count, Prefetch
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.utils.dateparse import parse_date
 from drf_spectacular.openapi import AutoSchema
-from drf_spectacular.utils import extend_schema, extend_schema_view
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
-from rest_framework.permissions import IsAdminUser
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
+from planetarium import holds, response_cache
+from planetarium.admission import admitted
+from planetarium.autocomplete import get_index as get_autocomplete_index
+from planetarium.fieldsets import parse_field_list, prune_queryset
 from planetarium.models import (
     AstronomyShow,
+    ModelVersion,
     ShowTheme,
     PlanetariumDome,
     ShowSession,
     Reservation,
+    ScheduleEntry,
     Ticket,
+    show_details_deferred,
 )
 from planetarium.permissions import IsAdminOrIfAuthenticatedReadOnly
+from planetarium.renderers import (
+    CSVRenderer,
+    NDJSONRenderer,
+    SeatBitmapRenderer,
+    StreamingJSONRenderer,
+)
+from planetarium.seating import pack_seat_bitmap, encode_seat_bitmap, find_best_block
 from planetarium.serializers import (
     AstronomyShowSerializer,
     ShowThemeSerializer,
@@ -23,24 +51,485 @@ from planetarium.serializers import (
     ShowSessionSerializer,
     ShowSessionListSerializer,
     ShowSessionDetailSerializer,
+    ShowSessionSeatsSerializer,
+    ShowSessionImportSerializer,
+    ScheduleDaySerializer,
+    AutocompleteSerializer,
+    BestSeatsSerializer,
     AstronomyShowDetailSerializer,
     ReservationSerializer,
+    ReservationCheckoutSerializer,
+    SeatHoldSerializer,
     TicketListSerializer,
     TicketDetailSerializer,
     TicketCreateSerializer,
+    ShowSessionListValuesSerializer,
+    TicketListValuesSerializer,
+    TicketExportSerializer,
+    ReservationExportSerializer,
 )
 
+# Days covered by the schedule endpoint by default and at most.
+SCHEDULE_DEFAULT_DAYS = 7
+SCHEDULE_MAX_DAYS = 31
+
 
 class DynamicSerializerMixin:
     """
     A mixin that dynamically selects a serializer class based on action.
+
+    Read actions also support sparse fieldsets: `?fields=title,show_time`
+    keeps only the listed fields and `?omit=description` drops fields. The
+    queryset is narrowed to match, so omitted columns and relations are not
+    loaded at all.
     """
 
     action_serializer_classes = {}
+    sparse_fieldset_actions = ("list", "retrieve")
+    # Model fields read by serializer fields that are not model fields.
+    sparse_field_requires = {}
 
     def get_serializer_class(self):
         return self.action_serializer_classes.get(self.action, self.serializer_class)
 
+    def get_omitted_fields(self, field_names):
+        if self.action not in self.sparse_fieldset_actions:
+            return set()
+
+        fields = parse_field_list(self.request.query_params.get("fields"))
+        omit = parse_field_list(self.request.query_params.get("omit"))
+
+        return {
+            name
+            for name in field_names
+            if name in omit or (fields and name not in fields)
+        }
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        target = getattr(serializer, "child", serializer)
+
+        for name in self.get_omitted_fields(list(target.fields)):
+            target.fields.pop(name)
+
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer_fields = self.get_serializer_class()().fields
+        omitted = self.get_omitted_fields(serializer_fields)
+
+        if omitted:
+            queryset = prune_queryset(
+                queryset, serializer_fields, omitted, self.sparse_field_requires
+            )
+
+        return queryset
+
+
+class ValuesListMixin:
+    """
+    Serve the list action from values() rows with `values_serializer_class`
+    instead of building model instances and running the model serializer.
+
+    Use together with DynamicSerializerMixin, whose sparse fieldsets it
+    honours.
+    """
+
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if self.values_serializer_class is None:
+            return super().list(request, *args, **kwargs)
+
+        serializer = self.values_serializer_class(
+            omitted=self.get_omitted_fields(self.values_serializer_class.columns)
+        )
+        queryset = serializer.project(
+            self.filter_queryset(self.get_queryset()),
+            extra_columns=[
+                field.lstrip("-") for field in get_pagination_ordering(self.paginator)
+            ],
+        )
+        page = self.paginate_queryset(queryset)
+
+        if page is not None:
+            return self.get_paginated_response(serializer.many(page))
+
+        return Response(serializer.many(queryset))
+
+
+def get_pagination_ordering(paginator):
+    ordering = getattr(paginator, "ordering", None) or ()
+
+    return (ordering,) if isinstance(ordering, str) else tuple(ordering)
+
+
+class StreamingListMixin:
+    """
+    Let staff users fetch the whole, unpaginated list with ?format=stream.
+
+    The list is read with a chunked iterator and encoded chunk by chunk
+    into a StreamingHttpResponse, so memory use does not grow with the
+    size of the list.
+    """
+
+    stream_chunk_size = 1000
+
+    def get_renderers(self):
+        return [*super().get_renderers(), StreamingJSONRenderer()]
+
+    def list(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+
+        if not isinstance(renderer, StreamingJSONRenderer):
+            return super().list(request, *args, **kwargs)
+
+        if not request.user.is_staff:
+            raise PermissionDenied("Only staff users can stream full lists.")
+
+        queryset = self.filter_queryset(self.get_queryset())
+        ordering = get_pagination_ordering(self.paginator)
+
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+
+        return StreamingHttpResponse(
+            renderer.render_stream(
+                self.get_stream_items(queryset), self.stream_chunk_size
+            ),
+            content_type=renderer.media_type,
+        )
+
+    def get_stream_items(self, queryset):
+        values_serializer_class = getattr(self, "values_serializer_class", None)
+
+        if values_serializer_class is not None:
+            serializer = values_serializer_class(
+                omitted=self.get_omitted_fields(values_serializer_class.columns)
+            )
+            rows = serializer.project(queryset).iterator(self.stream_chunk_size)
+
+            return map(serializer.to_representation, rows)
+
+        return self.serialize_chunks(queryset.iterator(self.stream_chunk_size))
+
+    def serialize_chunks(self, objects):
+        while chunk := list(islice(objects, self.stream_chunk_size)):
+            yield from self.get_serializer(chunk, many=True).data
+
+
+EXPORT_PARAMETERS = [
+    OpenApiParameter(
+        "format",
+        type=OpenApiTypes.STR,
+        enum=["csv", "ndjson"],
+        description="Export format, CSV by default (ex. ?format=ndjson)",
+    ),
+    OpenApiParameter(
+        "show_session",
+        type={"type": "list", "items": {"type": "number"}},
+        description="Filter by show session ids (ex. ?show_session=1,2)",
+    ),
+    OpenApiParameter(
+        "astronomy_show",
+        type={"type": "list", "items": {"type": "number"}},
+        description="Filter by astronomy show ids (ex. ?astronomy_show=1)",
+    ),
+    OpenApiParameter(
+        "date_from",
+        type=OpenApiTypes.DATE,
+        description="Sessions on or after this date (ex. ?date_from=2024-11-01)",
+    ),
+    OpenApiParameter(
+        "date_to",
+        type=OpenApiTypes.DATE,
+        description="Sessions on or before this date (ex. ?date_to=2024-11-30)",
+    ),
+]
+
+
+class ExportMixin:
+    """
+    Staff-only `export/` action streaming all matching rows as CSV or
+    NDJSON.
+
+    Rows are read with values() and a chunked iterator, which uses a
+    server-side cursor on PostgreSQL, and are encoded chunk by chunk, so
+    memory use does not grow with the number of exported rows.
+    """
+
+    export_serializer_class = None
+    export_chunk_size = 2000
+
+    def get_export_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    @extend_schema(
+        parameters=EXPORT_PARAMETERS,
+        responses={
+            (200, "text/csv"): OpenApiTypes.STR,
+            (200, "application/x-ndjson"): OpenApiTypes.STR,
+        },
+    )
+    @action(
+        methods=["GET"],
+        detail=False,
+        url_path="export",
+        permission_classes=[IsAdminUser],
+        renderer_classes=[CSVRenderer, NDJSONRenderer],
+        pagination_class=None,
+    )
+    def export(self, request):
+        renderer = request.accepted_renderer
+        serializer = self.export_serializer_class()
+        rows = (
+            serializer.project(self.get_export_queryset())
+            .order_by("id")
+            .iterator(chunk_size=self.export_chunk_size)
+        )
+        response = StreamingHttpResponse(
+            renderer.render_stream(
+                map(serializer.to_representation, rows),
+                self.export_chunk_size,
+                fields=serializer.field_names,
+            ),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{self.basename}s.{renderer.format}"'
+        )
+
+        return response
+
+
+class CachedResponseMixin:
+    """
+    Cache the data of list and retrieve responses, see
+    planetarium.response_cache.
+
+    Cached data is keyed by the request URL and the generations of the
+    cache scopes it was built from: the scopes of `cache_list_models` for
+    lists, and the scope of the object plus those of `cache_detail_models`
+    for details. Model signals start new generations when rows change, so
+    invalidation is precise and no entries need deleting.
+    """
+
+    cache_list_models = ()
+    cache_detail_models = ()
+
+    def get_cache_scopes(self):
+        if self.action == "retrieve":
+            pk = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+
+            return [
+                response_cache.object_scope(self.queryset.model, pk),
+                *map(response_cache.model_scope, self.cache_detail_models),
+            ]
+
+        return [response_cache.model_scope(model) for model in self.cache_list_models]
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        config = response_cache.get_config()
+
+        if not config["ENABLED"]:
+            return handler(request, *args, **kwargs)
+
+        cache = response_cache.get_cache()
+        key = response_cache.response_key(
+            self.basename,
+            request.build_absolute_uri(),
+            response_cache.get_generations(self.get_cache_scopes()),
+        )
+        data = cache.get(key)
+
+        if data is not None:
+            return Response(data)
+
+        response = handler(request, *args, **kwargs)
+
+        if response.status_code == status.HTTP_200_OK:
+            timeout = config["TIMEOUTS"].get(self.basename, config["TIMEOUT"])
+
+            if self.action == "list":
+                timeout = config["LIST_TIMEOUTS"].get(self.basename, timeout)
+
+            cache.set(key, response.data, timeout=timeout)
+
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+
+class ConditionalGetMixin:
+    """
+    Conditional GET for list and retrieve from the ModelVersion stamps of
+    `version_models`, the models the responses are built from.
+
+    Responses carry a strong ETag and Last-Modified, and a request whose
+    If-None-Match or If-Modified-Since still matches gets 304 Not Modified
+    after a single version query, before the queryset is evaluated or
+    anything is serialized.
+    """
+
+    version_models = ()
+
+    def get_version_validators(self, request):
+        versions = ModelVersion.objects.for_models(self.version_models).values_list(
+            "name", "version", "updated_at"
+        )
+        stamp = ",".join(f"{name}:{version}" for name, version, _ in sorted(versions))
+        variant = "|".join(
+            (stamp, request.get_full_path(), request.accepted_media_type or "")
+        )
+        etag = f'"{hashlib.sha256(variant.encode()).hexdigest()[:32]}"'
+        last_modified = max(
+            (updated_at.timestamp() for _, _, updated_at in versions), default=None
+        )
+
+        return etag, last_modified
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_version_validators(request)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+
+        if response is None:
+            response = handler(request, *args, **kwargs)
+
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response["ETag"] = etag
+
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
+
+
+def params_to_ints(query_string):
+    """Converts a string list of ids like '1,2,3' to a list of ints."""
+    try:
+        return [int(str_id) for str_id in query_string.split(",")]
+    except ValueError:
+        raise ValidationError("Expected a comma separated list of ids.")
+
+
+def parse_date_param(query_params, name):
+    """
+    Return the start of the day given in the query parameter as an aware
+    datetime, or None if the parameter is missing.
+    """
+    value = query_params.get(name)
+
+    if not value:
+        return None
+
+    try:
+        date = parse_date(value)
+    except ValueError:
+        # Well formatted but impossible, e.g. 2024-02-30.
+        date = None
+
+    if date is None:
+        raise ValidationError({name: ["Enter a valid date in YYYY-MM-DD format."]})
+
+    return timezone.make_aware(datetime.combine(date, time.min))
+
+
+def get_show_time_filters(query_params, field="show_time"):
+    """
+    Return filter() arguments for the date_from/date_to query parameters
+    (inclusive).
+    """
+    date_from = parse_date_param(query_params, "date_from")
+    date_to = parse_date_param(query_params, "date_to")
+    filters = {}
+
+    if date_from:
+        filters[f"{field}__gte"] = date_from
+
+    if date_to:
+        try:
+            filters[f"{field}__lt"] = date_to + timedelta(days=1)
+        except OverflowError:
+            raise ValidationError({"date_to": ["Enter a date before 9999-12-31."]})
+
+    return filters
+
+
+def filter_by_show_time(queryset, query_params, field="show_time"):
+    """
+    Filter a queryset by the date_from/date_to query parameters (inclusive).
+    """
+    return queryset.filter(**get_show_time_filters(query_params, field))
+
+
+def get_show_session_filters(query_params, show_session="show_session"):
+    """
+    Return filter() arguments for the show_session, astronomy_show,
+    date_from and date_to query parameters, with `show_session` the path
+    to the show session. Apply them in one filter() call, so that across
+    a multi-valued relation they all match the same show session.
+    """
+    filters = get_show_time_filters(query_params, f"{show_session}__show_time")
+    show_session_ids = query_params.get("show_session")
+    astronomy_show_ids = query_params.get("astronomy_show")
+
+    if show_session_ids:
+        filters[f"{show_session}__in"] = params_to_ints(show_session_ids)
+
+    if astronomy_show_ids:
+        filters[f"{show_session}__astronomy_show__in"] = params_to_ints(
+            astronomy_show_ids
+        )
+
+    return filters
+
+
+def get_queue_token(request):
+    return request.headers.get("X-Queue-Token")
+
+
+def get_booked_show_session_ids(tickets):
+    """
+    Collect show session ids from a raw list of requested tickets.
+    """
+    show_session_ids = set()
+
+    if isinstance(tickets, list):
+        for ticket in tickets:
+            try:
+                show_session_ids.add(int(ticket["show_session"]))
+            except (KeyError, TypeError, ValueError):
+                continue
+
+    return show_session_ids
+
+
+SPARSE_FIELDSET_PARAMETERS = [
+    OpenApiParameter(
+        "fields",
+        type={"type": "list", "items": {"type": "string"}},
+        description="Only return these fields (ex. ?fields=title,image)",
+    ),
+    OpenApiParameter(
+        "omit",
+        type={"type": "list", "items": {"type": "string"}},
+        description="Leave these fields out (ex. ?omit=description)",
+    ),
+]
+
 
 class AstronomyShowPagination(PageNumberPagination):
     page_size = 10
@@ -48,15 +537,50 @@ class AstronomyShowPagination(PageNumberPagination):
     schema = AutoSchema()
 
 
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination over an indexed ordering, so every page costs the
+    same no matter how deep a client pages.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+
+class ShowSessionPagination(KeysetPagination):
+    ordering = ("show_time", "id")
+
+
+class ReservationPagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
+
+
+class TicketPagination(KeysetPagination):
+    ordering = ("id",)
+
+
 @extend_schema_view(
     list=extend_schema(
         summary="List all Astronomy Shows",
         description="Retrieve a paginated list of all astronomy shows available in the planetarium.",
+        parameters=[
+            OpenApiParameter(
+                "search",
+                type=OpenApiTypes.STR,
+                description=(
+                    "Full-text search over title and description, best matches "
+                    "first (ex. ?search=black holes)"
+                ),
+            ),
+            *SPARSE_FIELDSET_PARAMETERS,
+        ],
         responses=AstronomyShowListSerializer,
     ),
     retrieve=extend_schema(
         summary="Retrieve an Astronomy Show",
         description="Retrieve details of a single astronomy show by its ID.",
+        parameters=SPARSE_FIELDSET_PARAMETERS,
         responses=AstronomyShowDetailSerializer,
     ),
     create=extend_schema(
@@ -83,11 +607,20 @@ class AstronomyShowPagination(PageNumberPagination):
         responses={204: "No Content"},
     ),
 )
-class AstronomyShowViewSet(DynamicSerializerMixin, viewsets.ModelViewSet):
+class AstronomyShowViewSet(
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    DynamicSerializerMixin,
+    viewsets.ModelViewSet,
+):
     queryset = AstronomyShow.objects.all()
     serializer_class = AstronomyShowSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    throttle_scope = "browse"
     pagination_class = AstronomyShowPagination
+    # Shows are listed with the names of their themes.
+    version_models = (AstronomyShow, ShowTheme)
+    cache_list_models = (AstronomyShow, ShowTheme)
     action_serializer_classes = {
         "list": AstronomyShowListSerializer,
         "retrieve": AstronomyShowDetailSerializer,
@@ -95,7 +628,48 @@ class AstronomyShowViewSet(DynamicSerializerMixin, viewsets.ModelViewSet):
     }
 
     def get_queryset(self):
-        return AstronomyShow.objects.all()
+        queryset = AstronomyShow.objects.defer("search_vector")
+        search = self.request.query_params.get("search")
+
+        if self.action in ("list", "retrieve"):
+            queryset = queryset.prefetch_related("themes")
+
+        if self.action == "list" and search:
+            queryset = queryset.search(search)
+
+        return queryset
+
+    @extend_schema(
+        summary="Autocomplete Astronomy Show titles and Show Theme names",
+        description=(
+            "Return show titles and theme names containing a word that starts "
+            "with `q`, labels starting with `q` first. Served from an "
+            "in-memory index."
+        ),
+        parameters=[
+            OpenApiParameter("q", type=OpenApiTypes.STR, description="Prefix."),
+            OpenApiParameter(
+                "limit",
+                type=OpenApiTypes.INT,
+                description="Maximum number of suggestions (1-50, default 10).",
+            ),
+        ],
+        responses=AutocompleteSerializer(many=True),
+    )
+    @action(methods=["GET"], detail=False, url_path="autocomplete")
+    def autocomplete(self, request):
+        try:
+            limit = min(max(int(request.query_params.get("limit", 10)), 1), 50)
+        except ValueError:
+            raise ValidationError({"limit": ["A valid integer is required."]})
+
+        matches = get_autocomplete_index().search(
+            request.query_params.get("q", ""), limit
+        )
+
+        return Response(
+            [{"type": kind, "id": pk, "label": label} for kind, pk, label in matches]
+        )
 
     @extend_schema(
         summary="Upload Image for Astronomy Show",
@@ -140,10 +714,13 @@ class AstronomyShowViewSet(DynamicSerializerMixin, viewsets.ModelViewSet):
         responses=ShowThemeSerializer,
     ),
 )
-class ShowThemeViewSet(viewsets.ModelViewSet):
+class ShowThemeViewSet(ConditionalGetMixin, CachedResponseMixin, viewsets.ModelViewSet):
     queryset = ShowTheme.objects.all()
     serializer_class = ShowThemeSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    throttle_scope = "browse"
+    version_models = (ShowTheme,)
+    cache_list_models = (ShowTheme,)
 
     def get_queryset(self):
         return ShowTheme.objects.all()
@@ -161,10 +738,15 @@ class ShowThemeViewSet(viewsets.ModelViewSet):
         responses=PlanetariumDomeSerializer,
     ),
 )
-class PlanetariumDomeViewSet(viewsets.ModelViewSet):
+class PlanetariumDomeViewSet(
+    ConditionalGetMixin, CachedResponseMixin, viewsets.ModelViewSet
+):
     queryset = PlanetariumDome.objects.all()
     serializer_class = PlanetariumDomeSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    throttle_scope = "browse"
+    version_models = (PlanetariumDome,)
+    cache_list_models = (PlanetariumDome,)
 
     def get_queryset(self):
         return PlanetariumDome.objects.all()
@@ -172,13 +754,45 @@ class PlanetariumDomeViewSet(viewsets.ModelViewSet):
 
 @extend_schema_view(
     list=extend_schema(
-        summary="List all Show Sessions",
-        description="Retrieve a list of all show sessions.",
+        summary="List Show Sessions",
+        description=(
+            "Retrieve a list of show sessions ordered by show time, optionally "
+            "filtered by date range, astronomy show and planetarium dome."
+        ),
+        parameters=[
+            OpenApiParameter(
+                "date_from",
+                type=OpenApiTypes.DATE,
+                description="Sessions on or after this date (ex. ?date_from=2024-11-01)",
+            ),
+            OpenApiParameter(
+                "date_to",
+                type=OpenApiTypes.DATE,
+                description="Sessions on or before this date (ex. ?date_to=2024-11-03)",
+            ),
+            OpenApiParameter(
+                "astronomy_show",
+                type={"type": "list", "items": {"type": "number"}},
+                description="Filter by astronomy show ids (ex. ?astronomy_show=1,2)",
+            ),
+            OpenApiParameter(
+                "planetarium_dome",
+                type={"type": "list", "items": {"type": "number"}},
+                description="Filter by planetarium dome ids (ex. ?planetarium_dome=1)",
+            ),
+            OpenApiParameter(
+                "upcoming",
+                type=OpenApiTypes.BOOL,
+                description="Only sessions that have not started yet (ex. ?upcoming=true)",
+            ),
+            *SPARSE_FIELDSET_PARAMETERS,
+        ],
         responses=ShowSessionListSerializer,
     ),
     retrieve=extend_schema(
         summary="Retrieve a Show Session",
         description="Retrieve details of a show session by its ID.",
+        parameters=SPARSE_FIELDSET_PARAMETERS,
         responses=ShowSessionDetailSerializer,
     ),
     create=extend_schema(
@@ -205,23 +819,306 @@ class PlanetariumDomeViewSet(viewsets.ModelViewSet):
         responses={204: "No Content"},
     ),
 )
-class ShowSessionViewSet(DynamicSerializerMixin, viewsets.ModelViewSet):
+class ShowSessionViewSet(
+    CachedResponseMixin,
+    ValuesListMixin,
+    DynamicSerializerMixin,
+    viewsets.ModelViewSet,
+):
     queryset = ShowSession.objects.all()
     serializer_class = ShowSessionSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    throttle_scope = "browse"
+    pagination_class = ShowSessionPagination
+    values_serializer_class = ShowSessionListValuesSerializer
+    # Session details embed their show and dome; signals invalidate the
+    # sessions of a changed show, theme or dome one by one.
+    cache_list_models = (ShowSession, AstronomyShow, PlanetariumDome)
     action_serializer_classes = {
         "list": ShowSessionListSerializer,
         "retrieve": ShowSessionDetailSerializer,
     }
+    sparse_field_requires = {
+        "seats_left": ("capacity", "tickets_sold"),
+        "sold_out": ("capacity", "tickets_sold"),
+    }
 
     def get_queryset(self):
-        return ShowSession.objects.all()
+        queryset = ShowSession.objects.select_related("planetarium_dome")
+
+        if self.action in ("list", "retrieve"):
+            queryset = queryset.select_related("astronomy_show").defer(
+                "astronomy_show__search_vector"
+            )
+
+        if self.action == "list":
+            queryset = queryset.defer(*show_details_deferred("astronomy_show"))
+
+        if self.action == "retrieve":
+            queryset = queryset.prefetch_related("astronomy_show__themes")
+
+        if self.action == "list":
+            queryset = self.filter_sessions(queryset)
+
+        return queryset
+
+    def filter_sessions(self, queryset):
+        query_params = self.request.query_params
+        queryset = filter_by_show_time(queryset, query_params)
+        astronomy_show = query_params.get("astronomy_show")
+        planetarium_dome = query_params.get("planetarium_dome")
+
+        if astronomy_show:
+            queryset = queryset.filter(
+                astronomy_show_id__in=params_to_ints(astronomy_show)
+            )
+
+        if planetarium_dome:
+            queryset = queryset.filter(
+                planetarium_dome_id__in=params_to_ints(planetarium_dome)
+            )
+
+        if query_params.get("upcoming", "").lower() in ("1", "true", "yes"):
+            queryset = queryset.filter(show_time__gte=timezone.now())
+
+        return queryset
+
+    def get_taken_seats(self, show_session):
+        """
+        Return the sold seats of a session plus seats held by other buyers.
+        """
+        taken = set(
+            Ticket.objects.filter(show_session=show_session).values_list("row", "seat")
+        )
+        taken.update(
+            (row, seat)
+            for _, row, seat in holds.held_seats(
+                [show_session.id], exclude_user=self.request.user
+            )
+        )
+
+        return taken
+
+    @extend_schema(
+        summary="Daily schedule of Show Sessions",
+        description=(
+            "Return the show sessions between `date_from` and `date_to` "
+            f"(at most {SCHEDULE_MAX_DAYS} days, the coming week by default) "
+            "grouped by day, with their show, themes, dome and seats left. "
+            "Served from a precomputed read model in a single query."
+        ),
+        parameters=[
+            OpenApiParameter(
+                "date_from",
+                type=OpenApiTypes.DATE,
+                description="First day, today by default (ex. ?date_from=2024-11-01)",
+            ),
+            OpenApiParameter(
+                "date_to",
+                type=OpenApiTypes.DATE,
+                description="Last day (ex. ?date_to=2024-11-07)",
+            ),
+            OpenApiParameter(
+                "astronomy_show",
+                type={"type": "list", "items": {"type": "number"}},
+                description="Filter by astronomy show ids (ex. ?astronomy_show=1,2)",
+            ),
+            OpenApiParameter(
+                "planetarium_dome",
+                type={"type": "list", "items": {"type": "number"}},
+                description="Filter by planetarium dome ids (ex. ?planetarium_dome=1)",
+            ),
+        ],
+        responses=ScheduleDaySerializer(many=True),
+    )
+    @action(methods=["GET"], detail=False, url_path="schedule")
+    def schedule(self, request):
+        query_params = request.query_params
+        date_from = parse_date_param(query_params, "date_from")
+        date_to = parse_date_param(query_params, "date_to")
+        date_from = date_from.date() if date_from else timezone.localdate()
+        if date_to:
+            date_to = date_to.date()
+        else:
+            # Ends at the last representable date instead of overflowing.
+            date_to = date_from + min(
+                timedelta(days=SCHEDULE_DEFAULT_DAYS - 1), date.max - date_from
+            )
+
+        if not 0 <= (date_to - date_from).days < SCHEDULE_MAX_DAYS:
+            raise ValidationError(
+                {
+                    "date_to": [
+                        f"Expected a range of 1 to {SCHEDULE_MAX_DAYS} days "
+                        "starting at date_from."
+                    ]
+                }
+            )
+
+        entries = ScheduleEntry.objects.filter(date__range=(date_from, date_to))
+        astronomy_show = query_params.get("astronomy_show")
+        planetarium_dome = query_params.get("planetarium_dome")
+
+        if astronomy_show:
+            entries = entries.filter(
+                astronomy_show_id__in=params_to_ints(astronomy_show)
+            )
+
+        if planetarium_dome:
+            entries = entries.filter(
+                planetarium_dome_id__in=params_to_ints(planetarium_dome)
+            )
+
+        days = [
+            {"date": date, "sessions": list(sessions)}
+            for date, sessions in groupby(
+                entries.order_by("date", "show_time", "show_session_id"),
+                key=attrgetter("date"),
+            )
+        ]
+
+        return Response(ScheduleDaySerializer(days, many=True).data)
+
+    @extend_schema(
+        summary="Import Show Sessions",
+        description=(
+            "Create many show sessions at once. Every session is checked for "
+            "overlaps with the stored sessions of its dome and with the other "
+            "imported sessions using a single query; nothing is created if "
+            "any session is invalid. Staff only."
+        ),
+        request=ShowSessionImportSerializer,
+        responses={201: {"type": "object", "properties": {"ids": {"type": "array"}}}},
+    )
+    @action(
+        methods=["POST"],
+        detail=False,
+        url_path="import",
+        url_name="import",
+        permission_classes=[IsAdminUser],
+    )
+    def import_sessions(self, request):
+        serializer = ShowSessionImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        summary="Seat availability map of a Show Session",
+        description=(
+            "Return the taken seats of a show session as a packed bitmap with "
+            "one bit per seat (row by row, most significant bit first). "
+            "Send `Accept: application/octet-stream` to receive the raw bitmap, "
+            "otherwise the bitmap is base64 encoded together with a list of "
+            "taken [row, seat] pairs."
+        ),
+        responses=ShowSessionSeatsSerializer,
+    )
+    @action(
+        methods=["GET"],
+        detail=True,
+        url_path="seats",
+        renderer_classes=[*api_settings.DEFAULT_RENDERER_CLASSES, SeatBitmapRenderer],
+    )
+    def seats(self, request, pk=None):
+        show_session = self.get_object()
+        dome = show_session.planetarium_dome
+        taken = self.get_taken_seats(show_session)
+        bitmap = pack_seat_bitmap(dome.rows, dome.seats_in_row, taken)
+
+        if isinstance(request.accepted_renderer, SeatBitmapRenderer):
+            return Response(
+                bitmap,
+                headers={
+                    "X-Dome-Rows": str(dome.rows),
+                    "X-Dome-Seats-In-Row": str(dome.seats_in_row),
+                },
+            )
+
+        return Response(
+            {
+                "rows": dome.rows,
+                "seats_in_row": dome.seats_in_row,
+                "bitmap": encode_seat_bitmap(bitmap),
+                "taken": sorted([row, seat] for row, seat in taken),
+            }
+        )
+
+    @extend_schema(
+        summary="Best available seats of a Show Session",
+        description=(
+            "Return the block of `size` adjacent free seats in one row that is "
+            "closest to the centre of the dome."
+        ),
+        parameters=[
+            OpenApiParameter("size", type=int, required=True, description="Party size.")
+        ],
+        responses=BestSeatsSerializer,
+    )
+    @action(methods=["GET"], detail=True, url_path="best-seats")
+    def best_seats(self, request, pk=None):
+        serializer = BestSeatsSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        size = serializer.validated_data["size"]
+
+        show_session = self.get_object()
+        dome = show_session.planetarium_dome
+        block = find_best_block(
+            dome.rows, dome.seats_in_row, self.get_taken_seats(show_session), size
+        )
+
+        if block is None:
+            raise NotFound(f"No block of {size} adjacent free seats is available.")
+
+        row, seats = block
+
+        return Response(BestSeatsSerializer({"row": row, "seats": seats}).data)
+
+    @extend_schema(
+        summary="Hold seats of a Show Session",
+        description=(
+            "POST holds the given seats for the current user while they pay; "
+            "held seats are shown as taken to other buyers until the hold "
+            "expires. DELETE releases all holds of the current user on the "
+            "session."
+        ),
+        request=SeatHoldSerializer,
+        responses={201: SeatHoldSerializer, 204: None},
+    )
+    @action(
+        methods=["POST", "DELETE"],
+        detail=True,
+        url_path="hold",
+        permission_classes=[IsAuthenticated],
+        throttle_scope="booking",
+    )
+    def hold(self, request, pk=None):
+        show_session = self.get_object()
+
+        if request.method == "DELETE":
+            holds.release_seats(request.user, show_session)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        serializer = SeatHoldSerializer(
+            data=request.data,
+            context={"request": request, "show_session": show_session},
+        )
+
+        with admitted([show_session.id], get_queue_token(request)):
+            serializer.is_valid(raise_exception=True)
+            serializer.save(user=request.user)
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
 @extend_schema_view(
     list=extend_schema(
-        summary="List all Reservations",
-        description="Retrieve a list of all reservations.",
+        summary="List Reservations",
+        description=(
+            "Retrieve the reservations of the current user with their tickets. "
+            "Staff users see all reservations."
+        ),
         responses=ReservationSerializer,
     ),
     retrieve=extend_schema(
@@ -240,25 +1137,88 @@ class ShowSessionViewSet(DynamicSerializerMixin, viewsets.ModelViewSet):
         description="Delete a reservation by its ID.",
         responses={204: "No Content"},
     ),
+    export=extend_schema(
+        summary="Export Reservations",
+        description=(
+            "Stream all reservations with their ticket counts as CSV or NDJSON, "
+            "optionally only those with tickets for the given sessions, shows "
+            "or dates. Staff only."
+        ),
+    ),
 )
-class ReservationViewSet(viewsets.ModelViewSet):
+class ReservationViewSet(ExportMixin, StreamingListMixin, viewsets.ModelViewSet):
     queryset = Reservation.objects.all()
     serializer_class = ReservationSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    throttle_scope = "booking"
+    pagination_class = ReservationPagination
+    export_serializer_class = ReservationExportSerializer
 
     def get_queryset(self):
-        return Reservation.objects.all()
+        queryset = Reservation.objects.with_tickets()
+
+        if not self.request.user.is_staff:
+            queryset = queryset.filter(user_id=self.request.user.pk)
+
+        return queryset
+
+    def perform_create(self, serializer):
+        serializer.save(user_id=self.request.user.pk)
+
+    def get_export_queryset(self):
+        filters = get_show_session_filters(
+            self.request.query_params, "tickets__show_session"
+        )
+
+        return Reservation.objects.filter(**filters).annotate(
+            ticket_count=Count("tickets")
+        )
+
+    @extend_schema(
+        summary="Check out a Reservation with Tickets",
+        description=(
+            "Create a reservation for the current user together with all of its "
+            "tickets in a single transaction."
+        ),
+        request=ReservationCheckoutSerializer,
+        responses={201: ReservationSerializer},
+    )
+    @action(
+        methods=["POST"],
+        detail=False,
+        url_path="checkout",
+        permission_classes=[IsAuthenticated],
+    )
+    def checkout(self, request):
+        serializer = ReservationCheckoutSerializer(
+            data=request.data, context={"request": request}
+        )
+        show_session_ids = get_booked_show_session_ids(
+            request.data.get("tickets") if isinstance(request.data, dict) else None
+        )
+
+        with admitted(show_session_ids, get_queue_token(request)):
+            serializer.is_valid(raise_exception=True)
+            reservation = serializer.save(user=request.user)
+
+        reservation = Reservation.objects.with_tickets().get(pk=reservation.pk)
+
+        return Response(
+            ReservationSerializer(reservation).data, status=status.HTTP_201_CREATED
+        )
 
 
 @extend_schema_view(
     list=extend_schema(
         summary="List all Tickets",
         description="Retrieve a list of all tickets.",
+        parameters=SPARSE_FIELDSET_PARAMETERS,
         responses=TicketListSerializer,
     ),
     retrieve=extend_schema(
         summary="Retrieve a Ticket",
         description="Retrieve details of a single ticket by its ID.",
+        parameters=SPARSE_FIELDSET_PARAMETERS,
         responses=TicketDetailSerializer,
     ),
     create=extend_schema(
@@ -272,15 +1232,60 @@ class ReservationViewSet(viewsets.ModelViewSet):
         description="Delete a ticket by its ID.",
         responses={204: "No Content"},
     ),
+    export=extend_schema(
+        summary="Export Tickets",
+        description=(
+            "Stream all tickets with their sessions and buyers as CSV or NDJSON, "
+            "optionally filtered by session, show and date. Staff only."
+        ),
+    ),
 )
-class TicketViewSet(DynamicSerializerMixin, viewsets.ModelViewSet):
+class TicketViewSet(
+    ExportMixin,
+    StreamingListMixin,
+    ValuesListMixin,
+    DynamicSerializerMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Ticket.objects.all()
     serializer_class = TicketListSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    throttle_scope = "booking"
+    pagination_class = TicketPagination
+    values_serializer_class = TicketListValuesSerializer
+    export_serializer_class = TicketExportSerializer
     action_serializer_classes = {
         "create": TicketCreateSerializer,
         "retrieve": TicketDetailSerializer,
     }
 
     def get_queryset(self):
-        return Ticket.objects.all()
+        queryset = Ticket.objects.select_related(
+            "show_session__astronomy_show",
+            "show_session__planetarium_dome",
+            "reservation__user",
+        ).defer(*show_details_deferred("show_session__astronomy_show"))
+
+        if self.action == "retrieve":
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "reservation__tickets",
+                    queryset=Ticket.objects.select_related(
+                        "show_session__astronomy_show",
+                        "show_session__planetarium_dome",
+                    ).defer(*show_details_deferred("show_session__astronomy_show")),
+                )
+            )
+
+        return queryset
+
+    def get_export_queryset(self):
+        return Ticket.objects.filter(
+            **get_show_session_filters(self.request.query_params)
+        )
+
+    def create(self, request, *args, **kwargs):
+        show_session_ids = get_booked_show_session_ids([request.data])
+
+        with admitted(show_session_ids, get_queue_token(request)):
+            return super().create(request, *args, **kwargs)
@@ -0,0 +1,111 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser as BaseTokenUser
+
+DEFAULTS = {
+    "ENABLED": False,
+    "CACHE": "default",
+    "TTL": 30,
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "TOKEN_USER_CHECK", {})}
+
+
+def _state_key(user_id):
+    return f"token-user:state:{user_id}"
+
+
+def get_user_state(user_id):
+    """
+    Return (is_active, is_staff) of a user, or None if it does not exist,
+    from the cache when it was read less than TTL seconds ago.
+    """
+    config = get_config()
+    cache = caches[config["CACHE"]]
+    key = _state_key(user_id)
+    state = cache.get(key)
+
+    if state is None:
+        row = (
+            get_user_model()
+            .objects.filter(pk=user_id)
+            .values_list("is_active", "is_staff")
+            .first()
+        )
+        # Missing users are cached too, as an empty tuple.
+        state = tuple(row or ())
+        cache.set(key, state, timeout=config["TTL"])
+
+    return state or None
+
+
+def forget_user_state(user_id):
+    caches[get_config()["CACHE"]].delete(_state_key(user_id))
+
+
+class TokenUser(BaseTokenUser):
+    """
+    Request user built from the claims of a validated access token, see
+    user.serializers.TokenObtainPairSerializer.
+
+    Permission checks only need the id and is_staff, which the token
+    carries. Code needing the User row reads `instance`, which loads it on
+    first use.
+    """
+
+    @cached_property
+    def email(self):
+        return self.token.get("email", "")
+
+    @cached_property
+    def username(self):
+        return self.email
+
+    @cached_property
+    def instance(self):
+        try:
+            return get_user_model().objects.get(pk=self.id)
+        except get_user_model().DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+    def __str__(self):
+        return self.email or super().__str__()
+
+
+def get_user_instance(user):
+    """
+    Return the User row of a request user, which may be a TokenUser.
+    """
+    return user.instance if isinstance(user, TokenUser) else user
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    JWT authentication without a user query per request.
+
+    When TOKEN_USER_CHECK is enabled, the user's is_active and is_staff are
+    re-read at most every TTL seconds, so deactivated users are rejected
+    and staff changes apply before their tokens expire.
+    """
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+
+        if not get_config()["ENABLED"]:
+            return user
+
+        state = get_user_state(user.id)
+
+        if state is None or not state[0]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        user.is_staff = state[1]
+
+        return user
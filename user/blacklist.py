@@ -0,0 +1,247 @@
+import hashlib
+import math
+import secrets
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+DEFAULTS = {
+    # Only takes effect when CACHE is shared by every worker.
+    "ENABLED": True,
+    # Shared cache announcing new blacklisted tokens to other workers.
+    "CACHE": "default",
+    # Seconds before the filter is rebuilt, dropping expired tokens.
+    "MAX_AGE": 300,
+    "ERROR_RATE": 0.01,
+    # Newly blacklisted token ids a worker reads from the shared log before
+    # rebuilding the filter from the database instead.
+    "MAX_LOG_READ": 1000,
+}
+
+SEQUENCE_KEY = "token-blacklist:sequence"
+MIN_CAPACITY = 1024
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "TOKEN_BLACKLIST_FILTER", {})}
+
+
+def is_filter_enabled(config):
+    """
+    Return whether lookups may go through the filter. A per-process cache
+    would keep other workers from seeing new blacklisted tokens, so the
+    filter is skipped and every lookup queries the database.
+    """
+    return config["ENABLED"] and not isinstance(
+        caches[config["CACHE"]], (LocMemCache, DummyCache)
+    )
+
+
+def _log_key(sequence):
+    return f"token-blacklist:log:{sequence}"
+
+
+def get_sequence(cache):
+    """
+    Return the sequence number of the last blacklisted token id in the
+    shared log. An evicted sequence restarts from a random number, so it
+    does not repeat numbers workers have already read.
+    """
+    sequence = cache.get(SEQUENCE_KEY)
+
+    if sequence is None:
+        cache.add(SEQUENCE_KEY, secrets.randbits(48), timeout=None)
+        sequence = cache.get(SEQUENCE_KEY)
+
+    return sequence
+
+
+def read_log(cache, start, end):
+    """
+    Return the token ids logged after `start` up to `end`, or None if some
+    are missing, e.g. evicted or not written yet, or there are too many.
+    """
+    if not 0 < end - start <= get_config()["MAX_LOG_READ"]:
+        return None
+
+    keys = [_log_key(sequence) for sequence in range(start + 1, end + 1)]
+    jtis = cache.get_many(keys)
+
+    if len(jtis) < len(keys):
+        return None
+
+    return list(jtis.values())
+
+
+class BloomFilter:
+    """
+    Fixed-size set of strings that can only answer "maybe present" or
+    "absent", using about 10 bits per item at a 1% error rate.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = max(capacity, 1)
+        self.size = max(
+            64, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        step = int.from_bytes(digest[8:], "big") | 1
+
+        return [(first + i * step) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def is_full(self):
+        return self.count >= self.capacity
+
+
+class BlacklistFilter:
+    """
+    In-process Bloom filter of the blacklisted token ids, so lookups of
+    tokens that were never blacklisted, nearly all of them, skip the
+    database.
+
+    Blacklisting a token appends its id to a log in the shared cache;
+    workers seeing new entries add them to their filter before answering.
+    The filter is rebuilt from the database when it is older than MAX_AGE,
+    full, or entries are missing from the log.
+    """
+
+    def __init__(self):
+        # (filter, log sequence, built at)
+        self._state = None
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._state = None
+
+    def _build(self, config, sequence):
+        jtis = list(
+            BlacklistedToken.objects.filter(
+                token__expires_at__gt=timezone.now()
+            ).values_list("token__jti", flat=True)
+        )
+        bloom = BloomFilter(max(2 * len(jtis), MIN_CAPACITY), config["ERROR_RATE"])
+
+        for jti in jtis:
+            bloom.add(jti)
+
+        return bloom, sequence, time.monotonic()
+
+    def might_contain(self, jti):
+        config = get_config()
+        cache = caches[config["CACHE"]]
+        # Read before loading rows, so rows blacklisted meanwhile are logged
+        # after it.
+        sequence = get_sequence(cache)
+
+        with self._lock:
+            state = self._state
+
+            if (
+                state is None
+                or state[0].is_full()
+                or time.monotonic() - state[2] > config["MAX_AGE"]
+            ):
+                state = self._build(config, sequence)
+            elif state[1] != sequence:
+                logged = read_log(cache, state[1], sequence)
+
+                if logged is None:
+                    state = self._build(config, sequence)
+                else:
+                    for logged_jti in logged:
+                        state[0].add(logged_jti)
+
+                    state = (state[0], sequence, state[2])
+
+            self._state = state
+
+        return jti in state[0]
+
+
+blacklist_filter = BlacklistFilter()
+
+
+def is_blacklisted(jti):
+    if is_filter_enabled(get_config()) and not blacklist_filter.might_contain(jti):
+        return False
+
+    return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+def announce_blacklisted(jti):
+    """
+    Append a newly blacklisted token id to the shared log. It is logged
+    before the row commits, which is harmless: ids found in the filter are
+    still looked up in the database.
+    """
+    config = get_config()
+
+    if not is_filter_enabled(config):
+        return
+
+    cache = caches[config["CACHE"]]
+
+    while True:
+        get_sequence(cache)
+
+        try:
+            sequence = cache.incr(SEQUENCE_KEY)
+        except ValueError:
+            # Evicted since it was read.
+            continue
+
+        # Caches without an atomic incr can hand out a number twice.
+        if cache.add(_log_key(sequence), jti, timeout=config["MAX_AGE"] * 2):
+            return
+
+
+def prune_expired_tokens(batch_size=1000):
+    """
+    Delete expired outstanding tokens, and their blacklist entries, in
+    batches of `batch_size` so no transaction holds locks for long.
+    Returns the number of deleted outstanding tokens.
+    """
+    expired = (
+        OutstandingToken.objects.filter(expires_at__lte=timezone.now())
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    pruned = 0
+
+    while batch := list(expired[:batch_size]):
+        with transaction.atomic():
+            BlacklistedToken.objects.filter(token_id__in=batch).delete()
+            OutstandingToken.objects.filter(pk__in=batch).delete()
+
+        pruned += len(batch)
+
+    return pruned
@@ -0,0 +1,103 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+DEFAULTS = {
+    # Argon2id costs, the OWASP minimum by default: 19 MiB, 2 passes and a
+    # single lane hash in a few tens of milliseconds per core.
+    "ARGON2_TIME_COST": 2,
+    "ARGON2_MEMORY_COST": 19456,
+    "ARGON2_PARALLELISM": 1,
+    # Passwords hashed at the same time by one worker process, 0 to hash
+    # on the request thread.
+    "MAX_WORKERS": 2,
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "PASSWORD_HASHING", {})}
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """
+    Argon2 hasher with the costs of the PASSWORD_HASHING setting. Passwords
+    hashed with other costs, or with another hasher of PASSWORD_HASHERS,
+    are rehashed when their users log in.
+    """
+
+    @property
+    def time_cost(self):
+        return get_config()["ARGON2_TIME_COST"]
+
+    @property
+    def memory_cost(self):
+        return get_config()["ARGON2_MEMORY_COST"]
+
+    @property
+    def parallelism(self):
+        return get_config()["ARGON2_PARALLELISM"]
+
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Return the hashing thread pool of this process, creating it after a
+    fork, or None when hashing runs on the request thread.
+    """
+    global _executor, _executor_pid
+
+    max_workers = get_config()["MAX_WORKERS"]
+
+    if not max_workers:
+        return None
+
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="password-hashing"
+            )
+            _executor_pid = os.getpid()
+
+        return _executor
+
+
+def run_hashing(function, *args):
+    """
+    Run a hashing function in the bounded pool and wait for its result.
+
+    argon2 and hashlib release the GIL while hashing, so other request
+    threads keep running, and a burst of registrations or logins uses at
+    most MAX_WORKERS cores of the worker instead of one per request.
+    """
+    executor = get_executor()
+
+    if executor is None:
+        return function(*args)
+
+    return executor.submit(function, *args).result()
+
+
+def make_password(password):
+    return run_hashing(hashers.make_password, password)
+
+
+def check_password(password, encoded):
+    """
+    Return whether the password matches, and whether its hash should be
+    updated to the preferred hasher or costs.
+    """
+
+    def verify():
+        updates = []
+        is_correct = hashers.check_password(password, encoded, updates.append)
+
+        return is_correct, bool(updates)
+
+    return run_hashing(verify)
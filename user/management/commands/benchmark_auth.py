@@ -0,0 +1,85 @@
+import os
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from user.hashers import get_config
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure register and token requests per second on a single thread, "
+        "i.e. per core, with the configured password hasher. Everything the "
+        "benchmark writes is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=20,
+            help="Number of requests per endpoint.",
+        )
+
+    def handle(self, *args, **options):
+        count = options["requests"]
+        # Measure the hashing, not the auth rate limits.
+        rest_framework = {
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {
+                scope: None
+                for scope in settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]
+            },
+        }
+        client = Client(SERVER_NAME="localhost")
+        password = uuid.uuid4().hex
+        emails = [f"benchmark-{uuid.uuid4().hex}@example.com" for _ in range(count)]
+
+        with override_settings(
+            REST_FRAMEWORK=rest_framework,
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "localhost"],
+        ), transaction.atomic():
+            register = self.measure(
+                client,
+                reverse("user:create"),
+                [{"email": email, "password": password} for email in emails],
+                201,
+            )
+            token = self.measure(
+                client,
+                reverse("user:token_obtain_pair"),
+                [{"email": email, "password": password} for email in emails],
+                200,
+            )
+            transaction.set_rollback(True)
+
+        config = get_config()
+        self.stdout.write(
+            f"Hasher {get_hasher().algorithm}, hashing pool of "
+            f"{config['MAX_WORKERS']} threads, {os.cpu_count()} cores"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"register: {register:.1f} requests/s per core, "
+                f"token: {token:.1f} requests/s per core"
+            )
+        )
+
+    def measure(self, client, url, payloads, expected_status):
+        start = time.perf_counter()
+
+        for payload in payloads:
+            response = client.post(url, payload)
+
+            if response.status_code != expected_status:
+                raise RuntimeError(
+                    f"{url} returned {response.status_code}: {response.content!r}"
+                )
+
+        return len(payloads) / (time.perf_counter() - start)
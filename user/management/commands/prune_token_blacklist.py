@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from user.blacklist import prune_expired_tokens
+
+
+class Command(BaseCommand):
+    help = "Delete expired outstanding and blacklisted refresh tokens in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of tokens deleted per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        pruned = prune_expired_tokens(batch_size=options["batch_size"])
+
+        self.stdout.write(self.style.SUCCESS(f"Pruned {pruned} expired tokens"))
@@ -5,6 +5,8 @@ from django.contrib.auth.models import (
 from django.db import models
 from django.utils.translation import gettext as _
 
+from user import hashers
+
 
 class UserManager(BaseUserManager):
     """Define a model manager for User model with no username field."""
@@ -48,3 +50,20 @@ class User(AbstractUser):
     REQUIRED_FIELDS = []
 
     objects = UserManager()
+
+    def set_password(self, raw_password):
+        """Hash the password in the bounded hashing pool, see user.hashers"""
+        self.password = hashers.make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        """Check the password in the hashing pool, rehashing it if outdated"""
+        is_correct, must_update = hashers.check_password(raw_password, self.password)
+
+        if is_correct and must_update:
+            self.set_password(raw_password)
+            # Password hash upgrades shouldn't be considered password changes.
+            self._password = None
+            self.save(update_fields=["password"])
+
+        return is_correct
@@ -1,5 +1,18 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import (
+    TokenBlacklistSerializer as BaseTokenBlacklistSerializer,
+    TokenObtainPairSerializer as BaseTokenObtainPairSerializer,
+    TokenRefreshSerializer as BaseTokenRefreshSerializer,
+    TokenVerifySerializer as BaseTokenVerifySerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import UntypedToken
+
+from user.blacklist import is_blacklisted
+from user.tokens import RefreshToken
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -22,3 +35,78 @@ class UserSerializer(serializers.ModelSerializer):
             user.save()
 
         return user
+
+
+def set_user_claims(token, user):
+    """Set the claims user.authentication.TokenUser is built from"""
+    token["email"] = user.email
+    token["is_staff"] = user.is_staff
+
+
+class TokenObtainPairSerializer(BaseTokenObtainPairSerializer):
+    token_class = RefreshToken
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        set_user_claims(token, user)
+
+        return token
+
+
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        """
+        Refresh with the claims of the user as stored now, so staff changes
+        and deactivations apply on the next refresh instead of never.
+        """
+        refresh = self.token_class(attrs["refresh"])
+        user = (
+            get_user_model()
+            .objects.filter(
+                **{
+                    api_settings.USER_ID_FIELD: refresh.payload.get(
+                        api_settings.USER_ID_CLAIM
+                    )
+                }
+            )
+            .first()
+        )
+
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"], "no_active_account"
+            )
+
+        set_user_claims(refresh, user)
+        data = {"access": str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data["refresh"] = str(refresh)
+
+        return data
+
+
+class TokenBlacklistSerializer(BaseTokenBlacklistSerializer):
+    token_class = RefreshToken
+
+
+class TokenVerifySerializer(BaseTokenVerifySerializer):
+    def validate(self, attrs):
+        token = UntypedToken(attrs["token"])
+
+        if api_settings.BLACKLIST_AFTER_ROTATION and is_blacklisted(
+            token.get(api_settings.JTI_CLAIM)
+        ):
+            raise serializers.ValidationError(_("Token is blacklisted"))
+
+        return {}
@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from user.authentication import forget_user_state
+from user.blacklist import announce_blacklisted
+from user.models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_token_user_state(sender, instance, raw=False, **kwargs):
+    if not raw:
+        forget_user_state(instance.pk)
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def announce_blacklisted_token(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        announce_blacklisted(instance.token.jti)
@@ -1,11 +1,49 @@
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from io import StringIO
+
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import get_hasher, identify_hasher, make_password
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.timezone import make_aware
 from rest_framework import status
 from rest_framework.test import APITestCase
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
+from planetarium.models import (
+    AstronomyShow,
+    PlanetariumDome,
+    Reservation,
+    SeatHold,
+    ShowSession,
+)
+from user.blacklist import (
+    SEQUENCE_KEY,
+    BloomFilter,
+    blacklist_filter,
+    is_blacklisted,
+)
+from user.hashers import Argon2PasswordHasher, run_hashing
 from user.serializers import UserSerializer
 
+try:
+    import argon2
+except ImportError:
+    argon2 = None
+
 User = get_user_model()
 
 
@@ -86,3 +124,266 @@ class ManageUserViewTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.user.refresh_from_db()
         self.assertTrue(self.user.check_password(payload["password"]))
+
+
+class StatelessJWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="testuser@example.com", password="testpass123"
+        )
+        response = self.client.post(
+            reverse("user:token_obtain_pair"),
+            {"email": "testuser@example.com", "password": "testpass123"},
+        )
+        self.access = response.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+
+    def test_token_carries_user_claims(self):
+        token = AccessToken(self.access)
+        self.assertEqual(token["email"], self.user.email)
+        self.assertFalse(token["is_staff"])
+
+    def test_requests_do_not_load_the_user(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("planetarium:astronomyshow-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any(User._meta.db_table in query["sql"] for query in queries))
+
+    def test_token_user_books_seats(self):
+        show_session = ShowSession.objects.create(
+            astronomy_show=AstronomyShow.objects.create(title="Stars", description=""),
+            planetarium_dome=PlanetariumDome.objects.create(
+                name="Dome", rows=2, seats_in_row=2
+            ),
+            show_time=make_aware(datetime(2024, 1, 1, 10, 0)),
+        )
+        url = reverse("planetarium:showsession-hold", args=[show_session.id])
+        response = self.client.post(
+            url, {"seats": [{"row": 1, "seat": 1}]}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(SeatHold.objects.get().user, self.user)
+
+        response = self.client.post(
+            reverse("planetarium:reservation-checkout"),
+            {"tickets": [{"row": 1, "seat": 1, "show_session": show_session.id}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Reservation.objects.get().user, self.user)
+        self.assertFalse(SeatHold.objects.exists())
+
+    def test_refresh_reads_the_current_user_claims(self):
+        self.user.is_staff = True
+        self.user.save()
+        refresh = self.client.post(
+            reverse("user:token_obtain_pair"),
+            {"email": "testuser@example.com", "password": "testpass123"},
+        ).data["refresh"]
+        self.user.is_staff = False
+        self.user.save()
+
+        response = self.client.post(reverse("user:token_refresh"), {"refresh": refresh})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(AccessToken(response.data["access"])["is_staff"])
+        self.assertFalse(RefreshToken(response.data["refresh"])["is_staff"])
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        response = self.client.post(
+            reverse("planetarium:showtheme-list"), {"name": "Stars"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_refresh_rejects_inactive_users(self):
+        refresh = RefreshToken.for_user(self.user)
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.post(
+            reverse("user:token_refresh"), {"refresh": str(refresh)}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(TOKEN_USER_CHECK={"ENABLED": True})
+    def test_user_check_rejects_deactivated_users(self):
+        url = reverse("planetarium:reservation-list")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        # The throttle upsert and the reservations, the user state is cached.
+        with self.assertNumQueries(2):
+            self.client.get(url)
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class BloomFilterTests(SimpleTestCase):
+    def test_added_items_are_always_found(self):
+        bloom = BloomFilter(1000)
+        items = [f"jti-{i}" for i in range(1000)]
+
+        for item in items:
+            bloom.add(item)
+
+        self.assertTrue(all(item in bloom for item in items))
+        self.assertTrue(bloom.is_full())
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+class TokenBlacklistTests(APITestCase):
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        shared_cache = override_settings(
+            CACHES={
+                "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+                "shared": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": location,
+                },
+            },
+            TOKEN_BLACKLIST_FILTER={"CACHE": "shared"},
+        )
+        shared_cache.enable()
+        self.addCleanup(shared_cache.disable)
+        blacklist_filter.clear()
+        self.addCleanup(blacklist_filter.clear)
+        self.user = User.objects.create_user(
+            email="testuser@example.com", password="testpass123"
+        )
+        self.refresh = RefreshToken.for_user(self.user)
+
+    def test_rotated_refresh_token_is_rejected(self):
+        url = reverse("user:token_refresh")
+        response = self.client.post(url, {"refresh": str(self.refresh)})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.post(url, {"refresh": str(self.refresh)})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = self.client.post(
+            reverse("user:token_verify"), {"token": str(self.refresh)}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_lookups_of_tokens_never_blacklisted_skip_the_database(self):
+        self.refresh.blacklist()
+        self.assertTrue(is_blacklisted(self.refresh["jti"]))
+
+        with self.assertNumQueries(0):
+            self.assertFalse(is_blacklisted("never-blacklisted"))
+
+    def test_tokens_committed_out_of_id_order_are_loaded(self):
+        later = RefreshToken.for_user(self.user)
+        later.blacklist()
+        BlacklistedToken.objects.update(id=100)
+        self.assertFalse(is_blacklisted(self.refresh["jti"]))
+
+        token = OutstandingToken.objects.get(jti=self.refresh["jti"])
+        BlacklistedToken.objects.create(id=50, token=token)
+
+        self.assertTrue(is_blacklisted(self.refresh["jti"]))
+
+    def test_tokens_are_rejected_when_the_log_sequence_is_lost(self):
+        self.assertFalse(is_blacklisted(self.refresh["jti"]))
+        self.refresh.blacklist()
+        # The log was lost, e.g. evicted.
+        caches["shared"].delete(SEQUENCE_KEY)
+
+        response = self.client.post(
+            reverse("user:token_refresh"), {"refresh": str(self.refresh)}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_tokens_are_rejected_when_log_entries_are_lost(self):
+        self.assertFalse(is_blacklisted(self.refresh["jti"]))
+        self.refresh.blacklist()
+        sequence = caches["shared"].get(SEQUENCE_KEY)
+        caches["shared"].delete(f"token-blacklist:log:{sequence}")
+
+        self.assertTrue(is_blacklisted(self.refresh["jti"]))
+
+    def test_rotations_do_not_rebuild_the_filter(self):
+        url = reverse("user:token_refresh")
+        # The first refresh builds the filter.
+        response = self.client.post(url, {"refresh": str(self.refresh)})
+
+        for _ in range(3):
+            # The previous rotation's token id is read from the log instead
+            # of loading every blacklisted token again.
+            with self.assertNumQueries(13):
+                response = self.client.post(url, {"refresh": response.data["refresh"]})
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_per_process_cache_skips_the_filter(self):
+        with override_settings(TOKEN_BLACKLIST_FILTER={"CACHE": "default"}):
+            with self.assertNumQueries(1):
+                self.assertFalse(is_blacklisted("never-blacklisted"))
+
+    def test_prune_deletes_expired_tokens_only(self):
+        self.refresh.blacklist()
+        expired = RefreshToken.for_user(self.user)
+        expired.blacklist()
+        OutstandingToken.objects.filter(jti=expired["jti"]).update(
+            expires_at=timezone.now() - timedelta(minutes=1)
+        )
+        out = StringIO()
+
+        call_command("prune_token_blacklist", batch_size=1, stdout=out)
+
+        self.assertIn("Pruned 1 expired tokens", out.getvalue())
+        self.assertEqual(
+            list(BlacklistedToken.objects.values_list("token__jti", flat=True)),
+            [self.refresh["jti"]],
+        )
+
+
+class PasswordHashingTests(APITestCase):
+    def test_hashing_runs_in_the_pool(self):
+        name = run_hashing(lambda: threading.current_thread().name)
+        self.assertTrue(name.startswith("password-hashing"))
+
+        with override_settings(PASSWORD_HASHING={"MAX_WORKERS": 0}):
+            name = run_hashing(lambda: threading.current_thread().name)
+            self.assertEqual(name, threading.current_thread().name)
+
+    def test_outdated_hash_is_upgraded_on_login(self):
+        user = User.objects.create_user(email="user@test.com")
+        user.password = make_password("testpass123", hasher="pbkdf2_sha1")
+        user.save()
+
+        response = self.client.post(
+            reverse("user:token_obtain_pair"),
+            {"email": "user@test.com", "password": "testpass123"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertEqual(
+            identify_hasher(user.password).algorithm, get_hasher().algorithm
+        )
+        self.assertTrue(user.check_password("testpass123"))
+        self.assertFalse(user.check_password("wrong"))
+
+    @unittest.skipIf(argon2 is None, "argon2-cffi is not installed")
+    def test_argon2_costs_follow_settings(self):
+        hasher = Argon2PasswordHasher()
+        encoded = hasher.encode("password", hasher.salt())
+
+        with override_settings(PASSWORD_HASHING={"ARGON2_TIME_COST": 3}):
+            self.assertTrue(hasher.must_update(encoded))
+
+        self.assertFalse(hasher.must_update(encoded))
+
+    def test_benchmark_command(self):
+        out = StringIO()
+
+        call_command("benchmark_auth", requests=1, stdout=out)
+
+        self.assertIn("requests/s per core", out.getvalue())
+        self.assertFalse(User.objects.filter(email__startswith="benchmark").exists())
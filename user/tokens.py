@@ -0,0 +1,13 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+
+from user.blacklist import is_blacklisted
+
+
+class RefreshToken(BaseRefreshToken):
+    def check_blacklist(self):
+        """Check the blacklist through the in-process filter, see user.blacklist"""
+        if is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
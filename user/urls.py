@@ -1,12 +1,15 @@
 from django.urls import path
 from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
-    TokenRefreshView,
     TokenVerifyView,
     TokenBlacklistView,
 )
 
-from user.views import CreateUserView, ManageUserView
+from user.views import (
+    CreateUserView,
+    ManageUserView,
+    TokenObtainPairView,
+    TokenRefreshView,
+)
 
 app_name = "user"
 